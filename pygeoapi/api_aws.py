@@ -2,8 +2,30 @@
 This module offers functions to communicate with AWS services
 """
 
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
 # 3rd party imports
 import boto3, botocore, json  # noqa: E401
+import botocore.session
+from botocore.credentials import AssumeRoleCredentialFetcher, \
+    DeferredRefreshableCredentials
+
+LOGGER = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Size of the parts, and number of parts sent at the same time, when
+# streaming a file to S3
+S3_PART_SIZE = 16 * MB
+S3_PART_WORKERS = 4
+
+# S3 resources, with their refreshable credentials, per iam role
+_S3_RESOURCES = {}
+_S3_RESOURCES_LOCK = threading.Lock()
 
 
 def get_secret(region: str, service_name: str, secret_key: str):
@@ -27,46 +49,237 @@ def get_secret(region: str, service_name: str, secret_key: str):
     return json.loads(get_secret_value_response['SecretString'])
 
 
-def connect_s3_send_file(source_file: str, iam_role: str, bucket_name: str,
-                         prefix: str, file: str):
+def s3_file_exists(iam_role: str, bucket_name: str, prefix: str, file: str,
+                   max_age: timedelta = None):
     """
-    Uploads the given file to an S3 Bucket, given an iam_role and a bucket name
+    Checks if the given file is in an S3 Bucket, given an iam_role and a
+    bucket name
+
+    :param max_age: when given, a file older than that is considered missing
+
+    :returns: True if the file is there (and recent enough)
     """
 
+    # Get the S3 resource for the role, with cached credentials
+    s3_resource = _get_s3_resource(iam_role)
+
+    # Make sure it ends with a "/"
+    if not prefix.endswith("/"):
+        prefix = prefix + "/"
+
     try:
-        # Create an STS client object that represents a live connection to the
-        # STS service
-        sts_client = boto3.client('sts')
-
-        # Call the assume_role method of the STSConnection object and pass the
-        # role
-        # ARN and a role session name.
-        assumed_role_object = sts_client.assume_role(
-            RoleArn=iam_role,
-            RoleSessionName="AssumeRoleECS"
-        )
+        # Only read the headers of the file
+        head = s3_resource.meta.client.head_object(Bucket=bucket_name,
+                                                   Key=prefix + file)
 
-        # From the response that contains the assumed role, get the temporary
-        # credentials that can be used to make subsequent API calls
-        credentials = assumed_role_object['Credentials']
-
-        # Use the temporary credentials that AssumeRole returns to make a
-        # connection to Amazon S3
-        s3_resource = boto3.resource(
-            's3',
-            aws_access_key_id=credentials['AccessKeyId'],
-            aws_secret_access_key=credentials['SecretAccessKey'],
-            aws_session_token=credentials['SessionToken']
-        )
+    except botocore.exceptions.ClientError as e:
+        # If the file isn't there
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+            return False
+
+        # Without the s3:ListBucket permission, S3 answers a missing file
+        # with a 403, consider it missing
+        if e.response['Error']['Code'] in ('403', 'AccessDenied'):
+            LOGGER.warning(f"Access denied reading {prefix + file} in "
+                           f"{bucket_name}, considered missing")
+            return False
+        raise
+
+    # If the file is too old
+    if max_age is not None and \
+            datetime.now(timezone.utc) - head['LastModified'] > max_age:
+        return False
+    return True
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Writable file object which uploads what's written to it to an S3 Bucket,
+    given an iam_role and a bucket name, as the parts of a multipart upload.
+    The parts are sent in the background while the writing goes on, so the
+    file never has to be stored locally as a whole.
+
+    When used in a `with` block, the upload is completed at the end of the
+    block, or aborted if an exception happened.
+    """
+
+    def __init__(self, iam_role: str, bucket_name: str, prefix: str,
+                 file: str, part_size: int = S3_PART_SIZE,
+                 max_workers: int = S3_PART_WORKERS):
+        """
+        Initialize the multipart upload
+
+        :param iam_role: the iam role to assume to write in the bucket
+        :param bucket_name: the bucket name
+        :param prefix: the prefix (folder) of the file in the bucket
+        :param file: the file name in the bucket
+        :param part_size: the size of each part (at least 5 MB for S3)
+        :param max_workers: the number of parts sent at the same time
+        """
+
+        super().__init__()
 
         # Make sure it ends with a "/"
         if not prefix.endswith("/"):
             prefix = prefix + "/"
 
-        # Send the file to the bucket
-        s3_resource.Bucket(bucket_name).upload_file(source_file, prefix + file)
+        self._iam_role = iam_role
+        self._bucket_name = bucket_name
+        self._key = prefix + file
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._position = 0
+        self._parts = []
 
-    except botocore.exceptions.ClientError as e:
-        print("ERROR UPLOADING FILE TO S3")
-        print(str(e))
-        raise
+        # Bound the parts waiting to be sent, as they are held in memory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = threading.BoundedSemaphore(max_workers * 2)
+
+        # Start the multipart upload
+        self._upload_id = self._client().create_multipart_upload(
+            Bucket=self._bucket_name, Key=self._key)['UploadId']
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def write(self, b):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        self._buffer += b
+        self._position += len(b)
+
+        # Send the full parts
+        while len(self._buffer) >= self._part_size:
+            self._send_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return len(b)
+
+    def close(self):
+        """
+        Sends the last part and completes the multipart upload
+        """
+
+        if self.closed:
+            return
+
+        try:
+            # Send what remains (the last part can be smaller)
+            if self._buffer or not self._parts:
+                self._send_part(bytes(self._buffer))
+                self._buffer = bytearray()
+
+            # Wait for all the parts and complete the upload
+            parts = [f.result() for f in self._parts]
+            self._client().complete_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key,
+                UploadId=self._upload_id,
+                MultipartUpload={'Parts': parts})
+
+        except Exception:
+            self.abort()
+            raise
+
+        finally:
+            self._executor.shutdown()
+            super().close()
+
+    def abort(self):
+        """
+        Aborts the multipart upload, discarding the parts already sent
+        """
+
+        if self.closed:
+            return
+
+        try:
+            # Cancel the parts not started yet, and wait for the parts being
+            # sent before discarding them
+            for future in self._parts:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._client().abort_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key,
+                UploadId=self._upload_id)
+
+        finally:
+            super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+    def _client(self):
+        """
+        Returns the S3 client of the iam role, fetched for each request as
+        the upload can outlast a set of credentials
+        """
+
+        return _get_s3_resource(self._iam_role).meta.client
+
+    def _send_part(self, data: bytes):
+        """
+        Sends a part in the background
+        """
+
+        # Wait for room when too many parts are pending
+        self._pending.acquire()
+        part_number = len(self._parts) + 1
+        future = self._executor.submit(self._upload_part, part_number, data)
+        future.add_done_callback(lambda f: self._pending.release())
+        self._parts.append(future)
+
+    def _upload_part(self, part_number: int, data: bytes):
+        """
+        Uploads a part of the multipart upload
+        """
+
+        response = self._client().upload_part(
+            Bucket=self._bucket_name, Key=self._key,
+            UploadId=self._upload_id, PartNumber=part_number, Body=data)
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+
+def _get_s3_resource(iam_role: str):
+    """
+    Returns an S3 resource using the temporary credentials of the assumed
+    iam_role. The resource is reused, its credentials being refreshed by
+    botocore (assuming the role again) well before they expire, even in the
+    middle of a long upload.
+    """
+
+    with _S3_RESOURCES_LOCK:
+        # If a resource is cached for the role, reuse it
+        s3_resource = _S3_RESOURCES.get(iam_role)
+        if s3_resource:
+            return s3_resource
+
+        # The credentials of the container, used to assume the role
+        base_session = botocore.session.get_session()
+
+        # Assume the role, and again each time its credentials near expiry
+        fetcher = AssumeRoleCredentialFetcher(
+            client_creator=base_session.create_client,
+            source_credentials=base_session.get_credentials(),
+            role_arn=iam_role,
+            extra_args={'RoleSessionName': "AssumeRoleECS"}
+        )
+        credentials = DeferredRefreshableCredentials(
+            method='assume-role',
+            refresh_using=fetcher.fetch_credentials
+        )
+
+        # Use the refreshable credentials to make a connection to Amazon S3
+        role_session = botocore.session.Session()
+        role_session._credentials = credentials
+        s3_resource = boto3.session.Session(
+            botocore_session=role_session).resource('s3')
+
+        # Keep it for the next uploads
+        _S3_RESOURCES[iam_role] = s3_resource
+        return s3_resource
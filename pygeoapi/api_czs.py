@@ -1,11 +1,9 @@
 import os  # noqa: E401
 from http import HTTPStatus
 from typing import Any, Tuple, Union
-import psycopg2
-import psycopg2.extras
 from pygeoapi.linked_data import jsonldify
 from pygeoapi.api import API, APIRequest, pre_process
-from pygeoapi.util import to_json
+from pygeoapi.util import to_json, pg_pooled_conn
 from pygeoapi import api_collections
 from pygeoapi import api_aws
 from copy import deepcopy
@@ -104,22 +102,25 @@ class API_CZS(API):
                         # Load template for Coverage
                         providerDict = api_collections.load_template_rasterio(thisTemplate, d)  # noqa
 
-                    # If loading anything
+                    # If loading anything (the templates are parsed anew
+                    # for each collection, no need to copy them)
                     if providerDict:
-                        the_resources[d["collection_name"]] = deepcopy(providerDict)  # noqa
+                        the_resources[d["collection_name"]] = providerDict
 
                 else:
                     print("Collection already loaded: " + d["collection_name"])
                     # pass # Already loaded this resource key
 
-        # Add our custom process dynamically
+        # Add our custom process dynamically. The process only reads the
+        # collections, so it shares their definitions with the resources
+        # rather than deep copying all of them.
         the_resources['extract'] = {
             'type': 'process',
             'processor': {
                 'name': 'pygeoapi.process.extract_nrcan.ExtractNRCanProcessor',
                 'server': self.config["server"],
                 'settings': deepcopy(self.config["settings"]),
-                'collections': deepcopy(the_resources)
+                'collections': dict(the_resources)
             }
         }
 
@@ -307,15 +308,16 @@ class API_CZS(API):
 def open_conn(database):
     """
     Connects to the Clip Zip Ship database which holds the collections
-    informations.
+    informations. The connection is lent from a pool shared by the process
+    and must be used in a `with` block.
 
-    :returns: A :class:`~psycopg2` connection
+    :returns: A :class:`~psycopg2` connection context manager
     """
 
-    # Connects and returns the connection
+    # Lends a connection from the pool
     # print('Connecting to the PostgreSQL database...')
-    return psycopg2.connect(user=database["user"],
-                            password=database["password"],
-                            host=database["host"],
-                            port=database["port"],
-                            database=database["dbname"])
+    return pg_pooled_conn(user=database["user"],
+                          password=database["password"],
+                          host=database["host"],
+                          port=database["port"],
+                          database=database["dbname"])
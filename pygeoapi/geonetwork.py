@@ -5,6 +5,8 @@
     This class facilitates reading of a geonetwork result metadata information.
 '''
 
+import functools
+from typing import Any
 import xmltodict
 from urllib.parse import urlparse
 
@@ -71,6 +73,73 @@ URL_GEO_NETWORK = {
     "TYPE_CODE": "gmd:MD_KeywordTypeCode",
     "DECIMAL": "gco:Decimal"
 }
+
+# Module level constants for the keys, to avoid dictionary lookups
+_ROOT = URL_GEO_NETWORK["ROOT"]
+_METADATA = URL_GEO_NETWORK["METADATA"]
+_FILE_IDENTIFIER = URL_GEO_NETWORK["FILE_IDENTIFIER"]
+_LANGUAGE = URL_GEO_NETWORK["LANGUAGE"]
+_REFERENCE_SYSTEM_INFO = URL_GEO_NETWORK["REFERENCE_SYSTEM_INFO"]
+_REFERENCE_SYSTEM_IDENTIF = URL_GEO_NETWORK["REFERENCE_SYSTEM_IDENTIF"]
+_RS_IDENT = URL_GEO_NETWORK["RS_IDENT"]
+_RS_IDENTIF = URL_GEO_NETWORK["RS_IDENTIF"]
+_RS_IDENTIF_CODE = URL_GEO_NETWORK["RS_IDENTIF_CODE"]
+_IDENTIFY_INFO = URL_GEO_NETWORK["IDENTIFY_INFO"]
+_DISTRIBUTION_INFO = URL_GEO_NETWORK["DISTRIBUTION_INFO"]
+_DATA_IDENTIFY = URL_GEO_NETWORK["DATA_IDENTIFY"]
+_EXTENT = URL_GEO_NETWORK["EXTENT"]
+_EX_EXTENT = URL_GEO_NETWORK["EX_EXTENT"]
+_GEOGRAPHIC_ELEMENT = URL_GEO_NETWORK["GEOGRAPHIC_ELEMENT"]
+_GEOGRAPHIC_BOUNDING_BOX = URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX"]
+_GEOGRAPHIC_BOUNDING_BOX_WEST = URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_WEST"]
+_GEOGRAPHIC_BOUNDING_BOX_EAST = URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_EAST"]
+_GEOGRAPHIC_BOUNDING_BOX_SOUTH = \
+    URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_SOUTH"]
+_GEOGRAPHIC_BOUNDING_BOX_NORTH = \
+    URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_NORTH"]
+_TEMPORAL_ELEMENT = URL_GEO_NETWORK["TEMPORAL_ELEMENT"]
+_EX_TEMPORAL_EXTENT = URL_GEO_NETWORK["EX_TEMPORAL_EXTENT"]
+_TIME_PERIOD = URL_GEO_NETWORK["TIME_PERIOD"]
+_BEGIN_POSITION = URL_GEO_NETWORK["BEGIN_POSITION"]
+_END_POSITION = URL_GEO_NETWORK["END_POSITION"]
+_DISTRIBUTION = URL_GEO_NETWORK["DISTRIBUTION"]
+_TRANSFER_OPT = URL_GEO_NETWORK["TRANSFER_OPT"]
+_TRANSFER_DIGITAL = URL_GEO_NETWORK["TRANSFER_DIGITAL"]
+_TRANSFER_ONLINE = URL_GEO_NETWORK["TRANSFER_ONLINE"]
+_TRANSFER_ONLINE_RES = URL_GEO_NETWORK["TRANSFER_ONLINE_RES"]
+_TRANSFER_ONLINE_RES_LINK = URL_GEO_NETWORK["TRANSFER_ONLINE_RES_LINK"]
+_TRANSFER_ONLINE_RES_LINK_URL = URL_GEO_NETWORK["TRANSFER_ONLINE_RES_LINK_URL"]
+_TRANSFER_ONLINE_NAME = URL_GEO_NETWORK["TRANSFER_ONLINE_NAME"]
+_TRANSFER_ONLINE_RES_DESC = URL_GEO_NETWORK["TRANSFER_ONLINE_RES_DESC"]
+_TRANSFER_ONLINE_RES_DESC_CHAR = \
+    URL_GEO_NETWORK["TRANSFER_ONLINE_RES_DESC_CHAR"]
+_TOPIC_CATEGORY = URL_GEO_NETWORK["TOPIC_CATEGORY"]
+_TOPIC_CATEGORY_CODE = URL_GEO_NETWORK["TOPIC_CATEGORY_CODE"]
+_CITATION = URL_GEO_NETWORK["CITATION"]
+_CI_CITATION = URL_GEO_NETWORK["CI_CITATION"]
+_TITLE = URL_GEO_NETWORK["TITLE"]
+_FREE_TEXT = URL_GEO_NETWORK["FREE_TEXT"]
+_TEXT_GROUP = URL_GEO_NETWORK["TEXT_GROUP"]
+_LOCALIZED = URL_GEO_NETWORK["LOCALIZED"]
+_CHAR_STRING = URL_GEO_NETWORK["CHAR_STRING"]
+_DATE_STAMP = URL_GEO_NETWORK["DATE_STAMP"]
+_DATE_TIME = URL_GEO_NETWORK["DATE_TIME"]
+_DATE = URL_GEO_NETWORK["DATE"]
+_TEXT = URL_GEO_NETWORK["TEXT"]
+_CODE_LIST_VALUE = URL_GEO_NETWORK["CODE_LIST_VALUE"]
+_GRAPHIC_OVERVIEW = URL_GEO_NETWORK["GRAPHIC_OVERVIEW"]
+_BROWSE_GRAPHIC = URL_GEO_NETWORK["BROWSE_GRAPHIC"]
+_FILE_NAME = URL_GEO_NETWORK["FILE_NAME"]
+_DESC_KEYWORDS = URL_GEO_NETWORK["DESC_KEYWORDS"]
+_KEYWORDS = URL_GEO_NETWORK["KEYWORDS"]
+_KEYWORD = URL_GEO_NETWORK["KEYWORD"]
+_TYPE = URL_GEO_NETWORK["TYPE"]
+_TYPE_CODE = URL_GEO_NETWORK["TYPE_CODE"]
+_DECIMAL = URL_GEO_NETWORK["DECIMAL"]
+
+# Sentinel returned by the walkers when a path doesn't exist
+_NOT_FOUND = object()
+
 DETERMINANTS_EN = ["a", "an", "the"]
 DETERMINANTS_FR = ["le", "la", "les", "un", "une", "des"]
 
@@ -87,126 +156,126 @@ class GeoNetworkReader(object):
         responseJson = xmltodict.parse(xml_content)
 
         # If found
-        if URL_GEO_NETWORK["ROOT"] in responseJson and \
-           URL_GEO_NETWORK["METADATA"] in responseJson[URL_GEO_NETWORK["ROOT"]]:  # noqa
+        if _ROOT in responseJson and \
+           _METADATA in responseJson[_ROOT]:  # noqa
             # Grab root
-            self._meta_root = responseJson[URL_GEO_NETWORK["ROOT"]][URL_GEO_NETWORK["METADATA"]]  # noqa
+            self._meta_root = responseJson[_ROOT][_METADATA]  # noqa
 
             # Grab the UUID
-            self._uuid = _dig_node_one_value(self._meta_root, [URL_GEO_NETWORK["FILE_IDENTIFIER"],  # noqa
-                                                               URL_GEO_NETWORK["CHAR_STRING"]])  # noqa
+            self._uuid = _dig_first_value(self._meta_root, [_FILE_IDENTIFIER,  # noqa
+                                                            _CHAR_STRING])  # noqa
 
             # Grab the spatial reference system
-            self._srid = _dig_node_one_value(self._meta_root, [URL_GEO_NETWORK["REFERENCE_SYSTEM_INFO"],  # noqa
-                                                               URL_GEO_NETWORK["REFERENCE_SYSTEM_IDENTIF"],  # noqa
-                                                               URL_GEO_NETWORK["RS_IDENT"],  # noqa
-                                                               URL_GEO_NETWORK["RS_IDENTIF"],  # noqa
-                                                               URL_GEO_NETWORK["RS_IDENTIF_CODE"],  # noqa
-                                                               URL_GEO_NETWORK["CHAR_STRING"]]);  # noqa
+            self._srid = _dig_first_value(self._meta_root, [_REFERENCE_SYSTEM_INFO,  # noqa
+                                                            _REFERENCE_SYSTEM_IDENTIF,  # noqa
+                                                            _RS_IDENT,  # noqa
+                                                            _RS_IDENTIF,  # noqa
+                                                            _RS_IDENTIF_CODE,  # noqa
+                                                            _CHAR_STRING]);  # noqa
 
             # Grab the information
-            self._language = _dig_node_one_value(self._meta_root, [URL_GEO_NETWORK["LANGUAGE"],  # noqa
-                                                                   URL_GEO_NETWORK["CHAR_STRING"]])  # noqa
+            self._language = _dig_first_value(self._meta_root, [_LANGUAGE,  # noqa
+                                                                _CHAR_STRING])  # noqa
             # Grab data identification root
-            self._data_identif_root = _dig_node_one(self._meta_root, [URL_GEO_NETWORK["IDENTIFY_INFO"],  # noqa
-                                                                      URL_GEO_NETWORK["DATA_IDENTIFY"]])  # noqa
+            self._data_identif_root = _dig_node_one(self._meta_root, [_IDENTIFY_INFO,  # noqa
+                                                                      _DATA_IDENTIFY])  # noqa
 
             # Grab the extent
             self._extent = {}
-            self._extent["west"] = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                                 URL_GEO_NETWORK["EX_EXTENT"],  # noqa
-                                                                                 URL_GEO_NETWORK["GEOGRAPHIC_ELEMENT"],  # noqa
-                                                                                 URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX"],  # noqa
-                                                                                 URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_WEST"],  # noqa
-                                                                                 URL_GEO_NETWORK["DECIMAL"]])  # noqa
-            self._extent["east"] = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                                 URL_GEO_NETWORK["EX_EXTENT"],  # noqa
-                                                                                 URL_GEO_NETWORK["GEOGRAPHIC_ELEMENT"],  # noqa
-                                                                                 URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX"],  # noqa
-                                                                                 URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_EAST"],  # noqa
-                                                                                 URL_GEO_NETWORK["DECIMAL"]])  # noqa
-            self._extent["south"] = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                                  URL_GEO_NETWORK["EX_EXTENT"],  # noqa
-                                                                                  URL_GEO_NETWORK["GEOGRAPHIC_ELEMENT"],  # noqa
-                                                                                  URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX"],  # noqa
-                                                                                  URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_SOUTH"],  # noqa
-                                                                                  URL_GEO_NETWORK["DECIMAL"]])  # noqa
-            self._extent["north"] = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                                  URL_GEO_NETWORK["EX_EXTENT"],  # noqa
-                                                                                  URL_GEO_NETWORK["GEOGRAPHIC_ELEMENT"],  # noqa
-                                                                                  URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX"],  # noqa
-                                                                                  URL_GEO_NETWORK["GEOGRAPHIC_BOUNDING_BOX_NORTH"],  # noqa
-                                                                                  URL_GEO_NETWORK["DECIMAL"]])  # noqa
+            self._extent["west"] = _dig_first_value(self._data_identif_root, [_EXTENT,  # noqa
+                                                                              _EX_EXTENT,  # noqa
+                                                                              _GEOGRAPHIC_ELEMENT,  # noqa
+                                                                              _GEOGRAPHIC_BOUNDING_BOX,  # noqa
+                                                                              _GEOGRAPHIC_BOUNDING_BOX_WEST,  # noqa
+                                                                              _DECIMAL])  # noqa
+            self._extent["east"] = _dig_first_value(self._data_identif_root, [_EXTENT,  # noqa
+                                                                              _EX_EXTENT,  # noqa
+                                                                              _GEOGRAPHIC_ELEMENT,  # noqa
+                                                                              _GEOGRAPHIC_BOUNDING_BOX,  # noqa
+                                                                              _GEOGRAPHIC_BOUNDING_BOX_EAST,  # noqa
+                                                                              _DECIMAL])  # noqa
+            self._extent["south"] = _dig_first_value(self._data_identif_root, [_EXTENT,  # noqa
+                                                                               _EX_EXTENT,  # noqa
+                                                                               _GEOGRAPHIC_ELEMENT,  # noqa
+                                                                               _GEOGRAPHIC_BOUNDING_BOX,  # noqa
+                                                                               _GEOGRAPHIC_BOUNDING_BOX_SOUTH,  # noqa
+                                                                               _DECIMAL])  # noqa
+            self._extent["north"] = _dig_first_value(self._data_identif_root, [_EXTENT,  # noqa
+                                                                               _EX_EXTENT,  # noqa
+                                                                               _GEOGRAPHIC_ELEMENT,  # noqa
+                                                                               _GEOGRAPHIC_BOUNDING_BOX,  # noqa
+                                                                               _GEOGRAPHIC_BOUNDING_BOX_NORTH,  # noqa
+                                                                               _DECIMAL])  # noqa
 
             # Grab the time extent
             self._temporal_extent = {}
-            self._temporal_extent["begin"] = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                                           URL_GEO_NETWORK["EX_EXTENT"],  # noqa
-                                                                                           URL_GEO_NETWORK["TEMPORAL_ELEMENT"],  # noqa
-                                                                                           URL_GEO_NETWORK["EX_TEMPORAL_EXTENT"],  # noqa
-                                                                                           URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                                           URL_GEO_NETWORK["TIME_PERIOD"],  # noqa
-                                                                                           URL_GEO_NETWORK["BEGIN_POSITION"]])  # noqa
-            self._temporal_extent["end"] = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                               URL_GEO_NETWORK["EX_EXTENT"],  # noqa
-                                                                               URL_GEO_NETWORK["TEMPORAL_ELEMENT"],  # noqa
-                                                                               URL_GEO_NETWORK["EX_TEMPORAL_EXTENT"],  # noqa
-                                                                               URL_GEO_NETWORK["EXTENT"],  # noqa
-                                                                               URL_GEO_NETWORK["TIME_PERIOD"],  # noqa
-                                                                               URL_GEO_NETWORK["END_POSITION"]])  # noqa
+            self._temporal_extent["begin"] = _dig_first_value(self._data_identif_root, [_EXTENT,  # noqa
+                                                                                        _EX_EXTENT,  # noqa
+                                                                                        _TEMPORAL_ELEMENT,  # noqa
+                                                                                        _EX_TEMPORAL_EXTENT,  # noqa
+                                                                                        _EXTENT,  # noqa
+                                                                                        _TIME_PERIOD,  # noqa
+                                                                                        _BEGIN_POSITION])  # noqa
+            self._temporal_extent["end"] = _dig_first_value(self._data_identif_root, [_EXTENT,  # noqa
+                                                                                      _EX_EXTENT,  # noqa
+                                                                                      _TEMPORAL_ELEMENT,  # noqa
+                                                                                      _EX_TEMPORAL_EXTENT,  # noqa
+                                                                                      _EXTENT,  # noqa
+                                                                                      _TIME_PERIOD,  # noqa
+                                                                                      _END_POSITION])  # noqa
 
             # Grab distribution root
-            self._distribution_info_root = _dig_node_one(self._meta_root, [URL_GEO_NETWORK["DISTRIBUTION_INFO"],  # noqa
-                                                                           URL_GEO_NETWORK["DISTRIBUTION"]])  # noqa
+            self._distribution_info_root = _dig_node_one(self._meta_root, [_DISTRIBUTION_INFO,  # noqa
+                                                                           _DISTRIBUTION])  # noqa
 
             # Grab transfer options
-            self._transfer_options = _dig_node_one(self._distribution_info_root, [URL_GEO_NETWORK["TRANSFER_OPT"]])  # noqa
+            self._transfer_options = _dig_node_one(self._distribution_info_root, [_TRANSFER_OPT])  # noqa
 
             # If a dictionary, move to a list
             if isinstance(self._transfer_options, dict):
                 self._transfer_options = [self._transfer_options]
 
-            self._title_og = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["CITATION"],  # noqa
-                                                                           URL_GEO_NETWORK["CI_CITATION"],  # noqa
-                                                                           URL_GEO_NETWORK["TITLE"],  # noqa
-                                                                           URL_GEO_NETWORK["CHAR_STRING"]])  # noqa
+            self._title_og = _dig_first_value(self._data_identif_root, [_CITATION,  # noqa
+                                                                        _CI_CITATION,  # noqa
+                                                                        _TITLE,  # noqa
+                                                                        _CHAR_STRING])  # noqa
 
-            self._title_alt = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["CITATION"],  # noqa
-                                                                            URL_GEO_NETWORK["CI_CITATION"],  # noqa
-                                                                            URL_GEO_NETWORK["TITLE"],  # noqa
-                                                                            URL_GEO_NETWORK["FREE_TEXT"],  # noqa
-                                                                            URL_GEO_NETWORK["TEXT_GROUP"],  # noqa
-                                                                            URL_GEO_NETWORK["LOCALIZED"]])  # noqa
+            self._title_alt = _dig_first_value(self._data_identif_root, [_CITATION,  # noqa
+                                                                         _CI_CITATION,  # noqa
+                                                                         _TITLE,  # noqa
+                                                                         _FREE_TEXT,  # noqa
+                                                                         _TEXT_GROUP,  # noqa
+                                                                         _LOCALIZED])  # noqa
 
             # Grab the topic
             self._topic = "topic"
-            if URL_GEO_NETWORK["TOPIC_CATEGORY"] in self._data_identif_root:
-                self._topic = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["TOPIC_CATEGORY"],  # noqa
-                                                                            URL_GEO_NETWORK["TOPIC_CATEGORY_CODE"]])  # noqa
+            if _TOPIC_CATEGORY in self._data_identif_root:
+                self._topic = _dig_first_value(self._data_identif_root, [_TOPIC_CATEGORY,  # noqa
+                                                                         _TOPIC_CATEGORY_CODE])  # noqa
   # noqa
             # Grab the date
             self._date = ""
-            if URL_GEO_NETWORK["DATE_STAMP"] in self._meta_root and \
-               URL_GEO_NETWORK["DATE_TIME"] in self._meta_root[URL_GEO_NETWORK["DATE_STAMP"]]:  # noqa
-                self._date = _dig_node_one_value(self._meta_root, [URL_GEO_NETWORK["DATE_STAMP"], URL_GEO_NETWORK["DATE_TIME"]])  # noqa
+            if _DATE_STAMP in self._meta_root and \
+               _DATE_TIME in self._meta_root[_DATE_STAMP]:  # noqa
+                self._date = _dig_first_value(self._meta_root, [_DATE_STAMP, _DATE_TIME])  # noqa
 
-            elif URL_GEO_NETWORK["DATE_STAMP"] in self._meta_root and \
-                 URL_GEO_NETWORK["DATE"] in self._meta_root[URL_GEO_NETWORK["DATE_STAMP"]]:  # noqa
-                self._date = _dig_node_one_value(self._meta_root, [URL_GEO_NETWORK["DATE_STAMP"], URL_GEO_NETWORK["DATE"]])  # noqa  # noqa
+            elif _DATE_STAMP in self._meta_root and \
+                 _DATE in self._meta_root[_DATE_STAMP]:  # noqa
+                self._date = _dig_first_value(self._meta_root, [_DATE_STAMP, _DATE])  # noqa  # noqa
 
             # Grab the thumbnail url
-            self._thumbnail_url = _dig_node_one_value(self._data_identif_root, [URL_GEO_NETWORK["GRAPHIC_OVERVIEW"],  # noqa
-                                                                                URL_GEO_NETWORK["BROWSE_GRAPHIC"],  # noqa
-                                                                                URL_GEO_NETWORK["FILE_NAME"],  # noqa
-                                                                                URL_GEO_NETWORK["CHAR_STRING"]])  # noqa
+            self._thumbnail_url = _dig_first_value(self._data_identif_root, [_GRAPHIC_OVERVIEW,  # noqa
+                                                                             _BROWSE_GRAPHIC,  # noqa
+                                                                             _FILE_NAME,  # noqa
+                                                                             _CHAR_STRING])  # noqa
 
             # Check keywords
-            keywords_group = _dig_node_all(self._data_identif_root, [URL_GEO_NETWORK["DESC_KEYWORDS"],  # noqa
-                                                                     URL_GEO_NETWORK["KEYWORDS"]])  # noqa
+            keywords_group = _dig_node_all(self._data_identif_root, [_DESC_KEYWORDS,  # noqa
+                                                                     _KEYWORDS])  # noqa
 
             self._keywords_nice_group = {}
-            key_group = _dig_node_one_value(keywords_group, [URL_GEO_NETWORK["TYPE"],  # noqa
-                                                             URL_GEO_NETWORK["TYPE_CODE"]])  # noqa
+            key_group = _dig_first_value(keywords_group, [_TYPE,  # noqa
+                                                          _TYPE_CODE])  # noqa
 
             if key_group not in self._keywords_nice_group:
                 self._keywords_nice_group[key_group] = {
@@ -214,14 +283,14 @@ class GeoNetworkReader(object):
                     "alt": []
                 }
 
-            self._keywords_nice_group[key_group]["og"].extend(_dig_node_all_values(keywords_group, [URL_GEO_NETWORK["KEYWORD"],  # noqa
-                                                                                                    URL_GEO_NETWORK["CHAR_STRING"]]))  # noqa
+            self._keywords_nice_group[key_group]["og"].extend(_dig_node_all_values(keywords_group, [_KEYWORD,  # noqa
+                                                                                                    _CHAR_STRING]))  # noqa
 
-            self._keywords_nice_group[key_group]["alt"].extend(_dig_node_all_values(keywords_group, [URL_GEO_NETWORK["KEYWORD"],  # noqa
-                                                                                                     URL_GEO_NETWORK["FREE_TEXT"],  # noqa
-                                                                                                     URL_GEO_NETWORK["TEXT_GROUP"],  # noqa
-                                                                                                     URL_GEO_NETWORK["LOCALIZED"],  # noqa
-                                                                                                     URL_GEO_NETWORK["TEXT"]]))  # noqa
+            self._keywords_nice_group[key_group]["alt"].extend(_dig_node_all_values(keywords_group, [_KEYWORD,  # noqa
+                                                                                                     _FREE_TEXT,  # noqa
+                                                                                                     _TEXT_GROUP,  # noqa
+                                                                                                     _LOCALIZED,  # noqa
+                                                                                                     _TEXT]))  # noqa
 
             # Further split each node on the commas and rebuild the lists in
             # the dictionary (in case keywords are split by commas)
@@ -284,81 +353,111 @@ class GeoNetworkReader(object):
     def get_cogs(self):
 
         cogs_infos = []
+        is_english = self.is_english()
 
         # Loop on the transfer options nodes
         for trans_opt_node in self._transfer_options:
             # Get transfer digital if any
-            transf_node = trans_opt_node[URL_GEO_NETWORK["TRANSFER_DIGITAL"]]
+            transf_node = trans_opt_node[_TRANSFER_DIGITAL]
 
             # If existing
             if transf_node:
                 # If online tag in it
-                if URL_GEO_NETWORK["TRANSFER_ONLINE"] in transf_node:
+                if _TRANSFER_ONLINE in transf_node:
                     # Get the online nodes
-                    online_nodes = transf_node[URL_GEO_NETWORK["TRANSFER_ONLINE"]]  # noqa
+                    online_nodes = transf_node[_TRANSFER_ONLINE]  # noqa
 
                     # For each online node
                     for online in online_nodes:
                         # Read the url
-                        url = _dig_node_one_value(online, [URL_GEO_NETWORK["TRANSFER_ONLINE_RES"],  # noqa
-                                                           URL_GEO_NETWORK["TRANSFER_ONLINE_RES_LINK"],  # noqa
-                                                           URL_GEO_NETWORK["TRANSFER_ONLINE_RES_LINK_URL"]])  # noqa
+                        url = _dig_first_value(online, [_TRANSFER_ONLINE_RES,  # noqa
+                                                        _TRANSFER_ONLINE_RES_LINK,  # noqa
+                                                        _TRANSFER_ONLINE_RES_LINK_URL])  # noqa
 
                         # If the url points to the datacube cog
                         if url and url.endswith(".tif"):
-                            name_og =  _dig_node_one_value(online, [URL_GEO_NETWORK["TRANSFER_ONLINE_RES"],  # noqa
-                                                                    URL_GEO_NETWORK["TRANSFER_ONLINE_NAME"],  # noqa
-                                                                    URL_GEO_NETWORK["CHAR_STRING"]])  # noqa
+                            name_og =  _dig_first_value(online, [_TRANSFER_ONLINE_RES,  # noqa
+                                                                 _TRANSFER_ONLINE_NAME,  # noqa
+                                                                 _CHAR_STRING])  # noqa
 
-                            name_alt = _dig_node_one_value(online, [URL_GEO_NETWORK["TRANSFER_ONLINE_RES"],  # noqa
-                                                                    URL_GEO_NETWORK["TRANSFER_ONLINE_NAME"],  # noqa
-                                                                    URL_GEO_NETWORK["FREE_TEXT"],  # noqa
-                                                                    URL_GEO_NETWORK["TEXT_GROUP"],  # noqa
-                                                                    URL_GEO_NETWORK["LOCALIZED"]])  # noqa
+                            name_alt = _dig_first_value(online, [_TRANSFER_ONLINE_RES,  # noqa
+                                                                 _TRANSFER_ONLINE_NAME,  # noqa
+                                                                 _FREE_TEXT,  # noqa
+                                                                 _TEXT_GROUP,  # noqa
+                                                                 _LOCALIZED])  # noqa
 
                             # Read the url path
                             cogs_infos.append({
                                 "url": url,
-                                "url_path": urlparse(url).path,
+                                "url_path": _url_path(url),
                                 "name": {
-                                    "en": name_og if self.is_english() else name_alt,  # noqa
-                                    "fr": name_alt if self.is_english() else name_og  # noqa
+                                    "en": name_og if is_english else name_alt,  # noqa
+                                    "fr": name_alt if is_english else name_og  # noqa
                                 }
                             })
 
         return cogs_infos
 
 
-def _dig_node_one(starting_node, list_keys):
-    value = None
-    founds = _dig_node_all(starting_node, list_keys)
-    if len(founds) > 0:
-        value = founds.pop(0)
+@functools.lru_cache(maxsize=4096)
+def _url_path(url: str) -> str:
+    # The same CoG urls come back across transfer options, parse them once
+    return urlparse(url).path
+
+
+def _dig_node_one(starting_node: Any, list_keys: list) -> Any:
+    value = _dig_node_first(starting_node, list_keys)
+    if value is _NOT_FOUND:
+        value = None
     return value
 
 
-def _dig_node_one_value(starting_node, list_keys):
-    # Redirect
-    value = _dig_node_one(starting_node, list_keys)
+def _dig_first_value(starting_node: Any, list_keys: list) -> Any:
+    # Walk to the first leaf and resolve its value in the same pass
+    value = _dig_node_first(starting_node, list_keys)
+    if value is _NOT_FOUND:
+        return None
 
     # Make sure we read the "value" (not a dictionary due to namespaces being
     # read at the node level)
     if isinstance(value, dict):
-        if URL_GEO_NETWORK["TEXT"] in value:
-            value = value[URL_GEO_NETWORK["TEXT"]]
+        if _TEXT in value:
+            return value[_TEXT]
 
-        elif URL_GEO_NETWORK["CODE_LIST_VALUE"] in value:
-            value = value[URL_GEO_NETWORK["CODE_LIST_VALUE"]]
+        elif _CODE_LIST_VALUE in value:
+            return value[_CODE_LIST_VALUE]
     return value
 
 
-def _dig_node_all(starting_node, list_keys):
+def _dig_node_first(current_node: Any, list_keys: list, idx: int = 0) -> Any:
+    # Same walk as _dig_node_REC, but stops on the first leaf found
+    if idx == len(list_keys):
+        return current_node
+
+    # If the node is a dictionary
+    if isinstance(current_node, dict):
+        # If the key is missing, nothing down this path can match
+        child = current_node.get(list_keys[idx], _NOT_FOUND)
+        if child is _NOT_FOUND:
+            return _NOT_FOUND
+        return _dig_node_first(child, list_keys, idx + 1)
+
+    elif isinstance(current_node, list):
+        for itm in current_node:
+            found = _dig_node_first(itm, list_keys, idx)
+            if found is not _NOT_FOUND:
+                return found
+
+    return _NOT_FOUND
+
+
+def _dig_node_all(starting_node: Any, list_keys: list) -> list:
     founds = []
-    _dig_node_REC(starting_node, list_keys, founds)
+    _dig_node_REC(starting_node, tuple(list_keys), founds)
     return founds
 
 
-def _dig_node_all_values(starting_node, list_keys):
+def _dig_node_all_values(starting_node: Any, list_keys: list) -> list:
     # Redirect
     founds = _dig_node_all(starting_node, list_keys)
 
@@ -367,26 +466,25 @@ def _dig_node_all_values(starting_node, list_keys):
     found_values = []
     for f in founds:
         value = f
-        if isinstance(f, dict) and URL_GEO_NETWORK["TEXT"] in f:
-            value = f[URL_GEO_NETWORK["TEXT"]]
+        if isinstance(f, dict) and _TEXT in f:
+            value = f[_TEXT]
         found_values.append(value)
     return found_values
 
 
-def _dig_node_REC(current_node, list_keys, founds):
+def _dig_node_REC(current_node: Any, list_keys: tuple, founds: list,
+                  idx: int = 0) -> None:
     # If done
-    if len(list_keys) == 0:
+    if idx == len(list_keys):
         founds.append(current_node)
         return
 
     # If the node is a dictionary
     if isinstance(current_node, dict):
-        key = list_keys[0]
-        list_keys_local = list_keys.copy()
-        list_keys_local.pop(0)
+        key = list_keys[idx]
         if key in current_node:
-            _dig_node_REC(current_node[key], list_keys_local, founds)
+            _dig_node_REC(current_node[key], list_keys, founds, idx + 1)
 
     elif isinstance(current_node, list):
         for itm in current_node:
-            _dig_node_REC(itm, list_keys, founds)
+            _dig_node_REC(itm, list_keys, founds, idx)
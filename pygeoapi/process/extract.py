@@ -27,15 +27,27 @@
 #
 # =================================================================
 
+import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 from pygeoapi.process.base import BaseProcessor
-from pygeoapi.provider.base import ProviderPreconditionFailed
-from pygeoapi.util import (get_provider_by_type, get_crs_from_uri, CrsTransformSpec)  # noqa
+from pygeoapi.provider.base import (ProviderPreconditionFailed, ProviderTypeError)  # noqa
+from pygeoapi.util import (get_crs_from_uri, CrsTransformSpec, load_wkt)
 from pygeoapi.plugin import load_plugin
 
 LOGGER = logging.getLogger(__name__)
 
+# Maximum number of collections queried at the same time
+MAX_WORKERS = 8
+
+# Providers already loaded, keyed on their collection and type, shared by the
+# requests, with the definition they were loaded from
+_PLUGIN_CACHE = {}
+_PLUGIN_CACHE_LOCK = threading.Lock()
+
 #: Process metadata and description
 PROCESS_METADATA = {
     'version': '0.2.0',
@@ -122,25 +134,23 @@ class ExtractProcessor(BaseProcessor):
     feature and coverage are supported, but the logic could be scaled up.
     """
 
-    def __init__(self, processor_def, process_metadata):
+    def __init__(self, processor_def, process_metadata=PROCESS_METADATA):
         """
         Initialize the Extract Processor
 
         :param processor_def: provider definition
-        :param process_metadata: process metadata
+        :param process_metadata: process metadata (default is the extract
+                                 process metadata)
 
         :returns: pygeoapi.process.extract.ExtractProcessor
         """
 
-        # If none set, use default
-        if not process_metadata:
-            process_metadata = PROCESS_METADATA
-
         super().__init__(processor_def, process_metadata)
         self.colls = None
         self.geom_wkt = None
         self.geom_crs = None
         self.out_crs = None
+        self._providers_by_type = {}
 
     def get_collection_type(self, coll_name: str):
         """
@@ -152,11 +162,33 @@ class ExtractProcessor(BaseProcessor):
         :returns: the collection type
         """
 
-        # Read the configuration for it
-        c_conf = self.processor_def['collections'][coll_name]
+        # Get the collection type by its providers types
+        return _get_collection_type_from_types(
+            tuple(self.get_providers_by_type(coll_name)))
 
-        # Get the collection type by its providers
-        return self._get_collection_type_from_providers(c_conf['providers'])
+    def get_providers_by_type(self, coll_name: str):
+        """
+        Return the providers of a collection indexed by their type, keeping
+        the first provider of each type. The index is built once per
+        collection.
+
+        :param coll_name: the collection name
+
+        :returns: the provider definitions by provider type
+        """
+
+        providers = self._providers_by_type.get(coll_name)
+        if providers is None:
+            # Read the configuration for it
+            c_conf = self.processor_def['collections'][coll_name]
+
+            # Index the providers by type
+            providers = {}
+            for p in c_conf['providers']:
+                providers.setdefault(p['type'], p)
+            self._providers_by_type[coll_name] = providers
+
+        return providers
 
     def get_collection_coverage_mimetype(self, coll_name: str):
         """
@@ -189,35 +221,51 @@ class ExtractProcessor(BaseProcessor):
             if self.on_query_validate_inputs(data):
                 # Validate execution
                 if self.on_query_validate_execution(data):
-                    # For each collection to query
-                    query_res = {}
+                    # If the results are already available, skip the queries
+                    cached_res = self.on_query_cached(data)
+                    if cached_res is not None:
+                        return self.on_query_results(cached_res)
+
+                    # Query the collections concurrently, their providers
+                    # mostly wait on I/O (database, files, network)
+                    colls = list(dict.fromkeys(self.colls))
+                    results = {}
                     i = 1
                     message = "Collections:\n"
-                    for c in self.colls:
-                        # If running inside a job manager
-                        if self.process_manager:
-                            # The progression can be a value between 15 and 85
-                            # (<10 and >90 reserved by the process manager
-                            # itself)
-                            prog_value = ((85 - 15) * i / len(self.colls)) + 15  # noqa
-                            message = message + (" | " if i > 1 else "") + c
-
-                            # Update the job progress
-                            self.process_manager.update_job(
-                                self.job_id, {
-                                    'message': message,
-                                    'progress': prog_value
-                                })
-
-                        # Call on query with it which will query the
-                        # collection based on its provider
-                        query_res[c] = self.on_query(c,
-                                                     self.geom_wkt,
-                                                     self.geom_crs,
-                                                     self.out_crs)
-
-                        # Increment
-                        i = i+1
+                    with ThreadPoolExecutor(max_workers=min(len(colls), MAX_WORKERS)) as executor:  # noqa
+                        # Call on query with each collection which will query
+                        # the collection based on its provider
+                        futures = {executor.submit(self.on_query, c,
+                                                   self.geom_wkt,
+                                                   self.geom_crs,
+                                                   self.out_crs): c
+                                   for c in colls}
+
+                        # As each collection completes
+                        for future in as_completed(futures):
+                            c = futures[future]
+                            results[c] = future.result()
+
+                            # If running inside a job manager
+                            if self.process_manager:
+                                # The progression can be a value between 15
+                                # and 85 (<10 and >90 reserved by the process
+                                # manager itself)
+                                prog_value = ((85 - 15) * i / len(colls)) + 15  # noqa
+                                message = message + (" | " if i > 1 else "") + c  # noqa
+
+                                # Update the job progress
+                                self.process_manager.update_job(
+                                    self.job_id, {
+                                        'message': message,
+                                        'progress': prog_value
+                                    })
+
+                            # Increment
+                            i = i+1
+
+                    # Keep the results in the order of the collections
+                    query_res = {c: results[c] for c in colls}
 
                     # Finalize the results
                     self.on_query_finalize(data, query_res)
@@ -249,17 +297,17 @@ class ExtractProcessor(BaseProcessor):
         :returns: results of the process as provided by 'on_query_results'
         """
 
-        # Read the configuration for it
-        c_conf = self.processor_def['collections'][coll_name]
-
         # Get the collection type by its providers
-        c_type = self._get_collection_type_from_providers(c_conf['providers'])
+        c_type = self.get_collection_type(coll_name)
 
         # Get the provider by type
-        provider_def = get_provider_by_type(c_conf['providers'], c_type)
+        try:
+            provider_def = self.get_providers_by_type(coll_name)[c_type]
+        except KeyError:
+            raise ProviderTypeError('Invalid provider type requested')
 
-        # Load the plugin
-        p = load_plugin('provider', provider_def)
+        # Load the plugin (or reuse the one already loaded)
+        p = _load_provider(coll_name, provider_def)
 
         # If the collection has a provider of type feature
         if c_type == "feature":
@@ -341,6 +389,13 @@ class ExtractProcessor(BaseProcessor):
             # Store the input geometry
             self.geom_wkt = data['geom']
 
+            # If the geometry has nothing to clip with
+            if self._is_geometry_empty(self.geom_wkt):
+                # Error
+                err = ClippingAreaEmptyException()
+                LOGGER.warning(err)
+                raise err
+
         else:
             # Error
             err = ClippingAreaUndefinedException()
@@ -387,6 +442,19 @@ class ExtractProcessor(BaseProcessor):
         # All good
         return True
 
+    def on_query_cached(self, data: dict):
+        """
+        Override this method to provide results already available for the
+        inputs, in which case the collections aren't queried.
+
+        :param data: the input parameters, as-received, for the process
+
+        :returns: the results to send to 'on_query_results' or None to
+        query the collections.
+        """
+
+        return None
+
     def on_query_finalize(self, data: dict, query_res: dict):
         """
         Override this method to do further things with the extracted results
@@ -420,18 +488,20 @@ class ExtractProcessor(BaseProcessor):
         pass
 
     @staticmethod
-    def _get_collection_type_from_providers(providers: list):
+    def _is_geometry_empty(geom_wkt: str):
         """
-        Utility function to get a collection type from the providers list.
+        Utility function to check if a geometry wkt is unreadable, empty or,
+        for polygons, without any area.
         """
 
-        # For each provider
-        for p in providers:
-            if p['type'] == "feature":
-                return "feature"
-            elif p['type'] == "coverage":
-                return "coverage"
-        return None
+        try:
+            geom = load_wkt(geom_wkt)
+
+        except Exception:
+            return True
+
+        return geom.is_empty or \
+            (geom.geom_type in ('Polygon', 'MultiPolygon') and geom.area == 0)
 
     @staticmethod
     def _get_collection_mimetype_image_from_providers(providers: list):
@@ -450,6 +520,51 @@ class ExtractProcessor(BaseProcessor):
         return f'<ExtractProcessor> {self.name}'
 
 
+def _load_provider(coll_name: str, provider_def: dict):
+    """
+    Loads the provider plugin for the given collection provider, once per
+    process. A single plugin is kept per collection and provider type, and
+    it's replaced when a reload of the resources changed its definition.
+
+    :param coll_name: the collection name
+    :param provider_def: the provider definition
+
+    :returns: the provider plugin
+    """
+
+    key = (coll_name, provider_def['type'])
+    definition = json.dumps(provider_def, sort_keys=True, default=str)
+    with _PLUGIN_CACHE_LOCK:
+        cached = _PLUGIN_CACHE.get(key)
+    if cached and cached[0] == definition:
+        return cached[1]
+
+    # Load outside of the lock, providers may connect to their source
+    plugin = load_plugin('provider', provider_def)
+    with _PLUGIN_CACHE_LOCK:
+        cached = _PLUGIN_CACHE.get(key)
+        if cached and cached[0] == definition:
+            return cached[1]
+        _PLUGIN_CACHE[key] = (definition, plugin)
+
+    return plugin
+
+
+@lru_cache(maxsize=None)
+def _get_collection_type_from_types(types: tuple):
+    """
+    Utility function to get a collection type from the provider types.
+    """
+
+    # For each provider type
+    for t in types:
+        if t == "feature":
+            return "feature"
+        elif t == "coverage":
+            return "coverage"
+    return None
+
+
 class CollectionsUndefinedException(ProviderPreconditionFailed):
     """Exception raised when no collections are defined"""
     def __init__(self):
@@ -469,6 +584,12 @@ class ClippingAreaUndefinedException(ProviderPreconditionFailed):
         super().__init__("Input parameter 'geom' is undefined")
 
 
+class ClippingAreaEmptyException(ProviderPreconditionFailed):
+    """Exception raised when the clipping area is empty"""
+    def __init__(self):
+        super().__init__("Input parameter 'geom' is empty or invalid")
+
+
 class ClippingAreaCrsUndefinedException(ProviderPreconditionFailed):
     """Exception raised when no clipping area is defined"""
     def __init__(self):
@@ -446,9 +446,21 @@ class BaseManager:
             response_headers = {
                 'Preference-Applied': RequestedProcessExecutionMode.wait.value}  # noqa
         else:  # client has no preference
-            # according to OAPI - Processes spec we ought to respond with sync
-            LOGGER.debug('Synchronous execution')
-            handler = self._execute_handler_sync
+            job_control_options = processor.metadata.get(
+                'jobControlOptions', [])
+            # according to OAPI - Processes spec we ought to respond with
+            # sync, unless the process only supports async (e.g. long
+            # extractions uploading their results), then respond right away
+            process_only_async = (
+                ProcessExecutionMode.async_execute.value in job_control_options and  # noqa
+                ProcessExecutionMode.sync_execute.value not in job_control_options  # noqa
+                )
+            if self.is_async and process_only_async:
+                LOGGER.debug('Asynchronous execution')
+                handler = self._execute_handler_async
+            else:
+                LOGGER.debug('Synchronous execution')
+                handler = self._execute_handler_sync
             response_headers = None
         # TODO: handler's response could also be allowed to include more HTTP
         # headers
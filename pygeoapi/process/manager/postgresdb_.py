@@ -42,7 +42,7 @@ from pygeoapi.process.base import (
     JobResultNotFoundError,
 )
 from pygeoapi.process.manager.base import BaseManager
-from pygeoapi.util import JobStatus
+from pygeoapi.util import JobStatus, pg_pooled_conn
 
 LOGGER = logging.getLogger(__name__)
 
@@ -84,12 +84,13 @@ class PostgresDBManager(BaseManager):
 
     def open_conn(self):
         """
-        Returns a connection to the database
+        Returns a connection to the database, lent from a pool shared by the
+        process, to use in a `with` block
         """
 
-        return psycopg2.connect(host=self.host, port=self.port,
-                                dbname=self.dbname, user=self.user,
-                                password=self.password, sslmode="allow")
+        return pg_pooled_conn(host=self.host, port=self.port,
+                              dbname=self.dbname, user=self.user,
+                              password=self.password, sslmode="allow")
 
     def destroy(self) -> bool:
         """
@@ -50,29 +50,43 @@
 
 import logging
 
-from copy import deepcopy
 from geoalchemy2 import Geometry  # noqa - this isn't used explicitly but is needed to process Geometry columns
 from geoalchemy2.functions import ST_MakeEnvelope, ST_Transform, Find_SRID, \
-     ST_PolygonFromText, ST_Intersection, ST_MakeValid
+     ST_PolygonFromText, ST_Intersection, ST_MakeValid, ST_CoveredBy, \
+     ST_ClipByBox2D
 from geoalchemy2.shape import to_shape
 from pygeofilter.backends.sqlalchemy.evaluate import to_filter
 import pyproj
 import shapely
-from sqlalchemy import create_engine, MetaData, PrimaryKeyConstraint, asc, desc
+from sqlalchemy import create_engine, MetaData, PrimaryKeyConstraint, asc, \
+    case, desc, func, text
 from sqlalchemy.engine import URL
 from sqlalchemy.exc import InvalidRequestError, OperationalError
-from sqlalchemy.ext.automap import automap_base
-from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.sql.expression import and_
 
 from pygeoapi.provider.base import BaseProvider, \
     ProviderConnectionError, ProviderQueryError, ProviderItemNotFoundError
-from pygeoapi.util import get_transform_from_crs, get_area_from_wkt_in_km2
+from pygeoapi.util import get_transform_from_crs, get_area_from_wkt_in_km2, \
+    load_wkt
 
 _ENGINE_STORE = {}
 _TABLE_MODEL_STORE = {}
+_TABLE_SRID_STORE = {}
+_TABLE_FIELDS_STORE = {}
 LOGGER = logging.getLogger(__name__)
 
+# Number of rows fetched at a time from the database when querying
+QUERY_PAGE_SIZE = 10000
+
+# Connections kept, and extra connections allowed, in the pool of each
+# database. The extractions query many collections of a database at once.
+POOL_SIZE = 10
+POOL_MAX_OVERFLOW = 20
+
+# Delay, in seconds, after which a pooled connection is replaced
+POOL_RECYCLE = 1800
+
 
 class PostgreSQLProvider(BaseProvider):
     """Generic provider for Postgresql based on psycopg2
@@ -112,15 +126,27 @@ class PostgreSQLProvider(BaseProvider):
         self._engine, self.table_model = self._get_engine_and_table_model()
         LOGGER.debug(f'DB connection: {repr(self._engine.url)}')
 
-        # Read the table fields
-        self.fields = self.get_fields()
+        # Read the table fields, once per table
+        fields_store_key = (self.db_host, self.db_port, self.db_name,
+                            self.table, self.geom)
+        try:
+            self.fields = _TABLE_FIELDS_STORE[fields_store_key]
+        except KeyError:
+            self.fields = self.get_fields()
+            _TABLE_FIELDS_STORE[fields_store_key] = self.fields
         LOGGER.debug('Fields: {}'.format(self.fields))
 
-        # Read the table SRID
-        if self._is_table_spatial():
-            self.srid = self.get_srid()
-        else:
-            self.srid = None
+        # Read the table SRID, once per table
+        srid_store_key = (self.db_host, self.db_port, self.db_name,
+                          self.schema, self.table, self.geom)
+        try:
+            self.srid = _TABLE_SRID_STORE[srid_store_key]
+        except KeyError:
+            if self._is_table_spatial():
+                self.srid = self.get_srid()
+            else:
+                self.srid = None
+            _TABLE_SRID_STORE[srid_store_key] = self.srid
         LOGGER.debug('SRID: {}'.format(self.srid))
 
     def query(self, offset=0, limit=10, resulttype='results',
@@ -163,10 +189,13 @@ class PostgreSQLProvider(BaseProvider):
         LOGGER.debug('Preparing filters')
         property_filters = self._get_property_filters(properties)
         cql_filters = self._get_cql_filters(filterq)
-        spat_filter = self._get_spatial_filter(bbox, bbox_crs, geom_wkt, geom_crs)  # noqa
+        query_shape = self._get_query_shape(bbox, bbox_crs, geom_wkt, geom_crs)  # noqa
+        spat_filter = self._get_spatial_filter(query_shape)
         order_by_clauses = self._get_order_by_clauses(sortby, self.table_model)
-        selected_properties = self._select_properties_clause(select_properties,
-                                                             skip_geometry)
+        # The original geometry isn't read when the clipped one replaces it
+        replace_geometry = clip > 0 and clip != 2 and geom_wkt
+        selected_columns = self._select_properties_columns(
+            select_properties, skip_geometry or replace_geometry)
 
         LOGGER.debug('Querying PostGIS')
 
@@ -188,31 +217,50 @@ class PostgreSQLProvider(BaseProvider):
                 out_crs = pyproj.CRS.from_wkt(crs_transform_spec.target_crs_wkt).to_epsg()  # noqa
 
             if clip > 0 and geom_wkt:
+                geom_column = getattr(self.table_model, self.geom)
+                # Clip with the same shape as the one filtering the features
+                clip_shape = query_shape
+
+                # The features covered by the clipping shape are kept as-is,
+                # only the others go through the (costly) intersection. When
+                # clipping with a rectangle in the data projection, a bbox
+                # comparison is enough to tell, and the features are clipped
+                # by the box instead of a general intersection. The box
+                # clipping can output invalid polygons, they are made valid.
+                if str(geom_crs) == str(self.srid) and _is_rectangle(geom_wkt):  # noqa
+                    covered = geom_column.contained(clip_shape)
+                    intersection = ST_MakeValid(
+                        ST_ClipByBox2D(geom_column, clip_shape))
+                else:
+                    covered = ST_CoveredBy(geom_column, clip_shape)
+                    intersection = ST_Intersection(geom_column, clip_shape)
+                clipped = case((covered, geom_column), else_=intersection)
+
                 results = (
-                    session.query(self.table_model, ST_Transform(ST_Intersection(getattr(self.table_model, self.geom),  # noqa
-                                                                                 ST_Transform(ST_MakeValid(  # noqa
-                                                                                     ST_PolygonFromText(geom_wkt,  # noqa
-                                                                                                        geom_crs)),  # noqa
-                                                                                              self.srid)  # noqa
-                                                                                 ),  # noqa
-                                                                 out_crs).label('inters')  # noqa
-                                  )
+                    session.query(*selected_columns, ST_Transform(clipped, out_crs).label('_clipped'))  # noqa
                     .filter(property_filters)
                     .filter(cql_filters)
                     .filter(spat_filter)
                     .order_by(*order_by_clauses)
-                    .options(selected_properties)
                     .offset(offset))
             else:
-                results = (session.query(self.table_model)
+                results = (session.query(*selected_columns)
                            .filter(property_filters)
                            .filter(cql_filters)
                            .filter(spat_filter)
                            .order_by(*order_by_clauses)
-                           .options(selected_properties)
                            .offset(offset))
 
-            matched = results.count()
+            # Count the matching rows apart, without the clipped geometry nor
+            # the sorting, so that the clipping is only computed for the
+            # rows returned
+            matched = (session.query(func.count())
+                       .select_from(self.table_model)
+                       .filter(property_filters)
+                       .filter(cql_filters)
+                       .filter(spat_filter)
+                       .scalar())
+            matched = max(matched - offset, 0)
             if limit < matched:
                 returned = limit
             else:
@@ -237,14 +285,19 @@ class PostgreSQLProvider(BaseProvider):
             if resulttype == "hits" or not results:
                 response['numberReturned'] = 0
                 return response
-            for item in results.limit(limit):
+            # Fetch the rows by pages through a server side cursor, instead
+            # of loading the whole result set in memory at once. The rows are
+            # plain columns, no ORM object is built for them.
+            for item in results.limit(limit).yield_per(QUERY_PAGE_SIZE):
+                item_dict = dict(item._mapping)
                 if clip > 0 and geom_wkt:
-                    # Default to feature, with item[0]
-                    obj = self._sqlalchemy_to_feature(item[0], crs_transform_out)  # noqa
+                    # Default to feature, without the clipped geometry
+                    clipped_geom = item_dict.pop('_clipped')
+                    obj = self._dict_to_feature(item_dict, crs_transform_out)
 
-                    # Do more with say item[1] (clipped geometry already in
-                    # correct reference system)
-                    shapely_geom = to_shape(item[1])
+                    # Do more with the clipped geometry (already in correct
+                    # reference system)
+                    shapely_geom = to_shape(clipped_geom)
                     geojson_geom = shapely.geometry.mapping(shapely_geom)
 
                     if clip == 2:
@@ -259,7 +312,7 @@ class PostgreSQLProvider(BaseProvider):
                 else:
                     # Default
                     response['features'].append(
-                        self._sqlalchemy_to_feature(item, crs_transform_out)
+                        self._dict_to_feature(item_dict, crs_transform_out)
                     )
 
         return response
@@ -334,8 +387,7 @@ class PostgreSQLProvider(BaseProvider):
         # Execute query within self-closing database Session context
         with Session(self._engine) as session:
             # Retrieve data from database as feature
-            query = session.query(self.table_model)
-            item = query.get(identifier)
+            item = session.get(self.table_model, identifier)
             if item is None:
                 msg = f"No such item: {self.id_field}={identifier}."
                 raise ProviderItemNotFoundError(msg)
@@ -344,26 +396,24 @@ class PostgreSQLProvider(BaseProvider):
 
             # Drop non-defined properties
             if self.properties:
-                props = feature['properties']
-                dropping_keys = deepcopy(props).keys()
-                for item in dropping_keys:
-                    if item not in self.properties:
-                        props.pop(item)
+                feature['properties'] = {
+                    key: value
+                    for key, value in feature['properties'].items()
+                    if key in self.properties
+                }
 
-            # Add fields for previous and next items
+            # Add fields for previous and next items, both read in a single
+            # round-trip
             id_field = getattr(self.table_model, self.id_field)
-            prev_item = (session.query(self.table_model)
-                         .order_by(id_field.desc())
-                         .filter(id_field < identifier)
-                         .first())
-            next_item = (session.query(self.table_model)
-                         .order_by(id_field.asc())
-                         .filter(id_field > identifier)
-                         .first())
-            feature['prev'] = (getattr(prev_item, self.id_field)
-                               if prev_item is not None else identifier)
-            feature['next'] = (getattr(next_item, self.id_field)
-                               if next_item is not None else identifier)
+            prev_id = (session.query(func.max(id_field))
+                       .filter(id_field < identifier)
+                       .scalar_subquery())
+            next_id = (session.query(func.min(id_field))
+                       .filter(id_field > identifier)
+                       .scalar_subquery())
+            prev_id, next_id = session.query(prev_id, next_id).one()
+            feature['prev'] = prev_id if prev_id is not None else identifier
+            feature['next'] = next_id if next_id is not None else identifier
 
         return feature
 
@@ -384,15 +434,12 @@ class PostgreSQLProvider(BaseProvider):
         """
 
         with Session(self._engine) as session:
-            sql = f"SELECT count(*) FROM geometry_columns " \
-                  f"                WHERE f_table_schema = '{self.schema}'" \
-                  f"                      AND f_table_name = '{self.table}';"
-            result = session.execute(sql)
-            nb_rows = result.scalar()
-            if nb_rows != 0:
-                is_spatial = True  # Cursor is empty (the table is not spatial)
-            else:
-                is_spatial = False
+            sql = text("SELECT EXISTS (SELECT 1 FROM geometry_columns"
+                       "               WHERE f_table_schema = :schema"
+                       "                     AND f_table_name = :table)")
+            result = session.execute(sql, {'schema': self.schema,
+                                           'table': self.table})
+            is_spatial = bool(result.scalar())
 
         return is_spatial
 
@@ -419,13 +466,19 @@ class PostgreSQLProvider(BaseProvider):
             )
             conn_args = {
                 'client_encoding': 'utf8',
-                'application_name': 'pygeoapi'
+                'application_name': 'pygeoapi',
+                'keepalives': 1,
+                'keepalives_idle': 30
             }
             if self.db_options:
                 conn_args.update(self.db_options)
             engine = create_engine(
                 conn_str,
                 connect_args=conn_args,
+                pool_size=POOL_SIZE,
+                max_overflow=POOL_MAX_OVERFLOW,
+                pool_recycle=POOL_RECYCLE,
+                pool_use_lifo=True,
                 pool_pre_ping=True)
             _ENGINE_STORE[engine_store_key] = engine
 
@@ -475,40 +528,26 @@ class PostgreSQLProvider(BaseProvider):
                    f"{self.schema}.{self.table}.")
             raise ProviderQueryError(msg)
 
-        Base = automap_base(metadata=metadata)
-        Base.prepare(
-            name_for_scalar_relationship=self._name_for_scalar_relationship,
-        )
-        TableModel = getattr(Base.classes, self.table)
+        # Map a class on the table only; the provider reads its rows and never
+        # navigates relationships, so there's no need to automap them
+        Base = declarative_base(metadata=metadata)
+        TableModel = type(self.table, (Base,),
+                          {'__table__': sqlalchemy_table_def})
 
         return TableModel
 
-    @staticmethod
-    def _name_for_scalar_relationship(
-            base, local_cls, referred_cls, constraint,
-    ):
-        """Function used when automapping classes and relationships from
-        database schema and fixes potential naming conflicts.
-        """
-        name = referred_cls.__name__.lower()
-        local_table = local_cls.__table__
-        if name in local_table.columns:
-            newname = name + '_'
-            LOGGER.debug(
-                f'Already detected column name {name!r} in table '
-                f'{local_table!r}. Using {newname!r} for relationship name.'
-            )
-            return newname
-        return name
-
     def _sqlalchemy_to_feature(self, item, crs_transform_out=None):
+        # Add properties from item
+        item_dict = item.__dict__
+        item_dict.pop('_sa_instance_state')  # Internal SQLAlchemy metadata
+        return self._dict_to_feature(item_dict, crs_transform_out)
+
+    def _dict_to_feature(self, item_dict, crs_transform_out=None):
         feature = {
             'type': 'Feature'
         }
 
-        # Add properties from item
-        item_dict = item.__dict__
-        item_dict.pop('_sa_instance_state')  # Internal SQLAlchemy metadata
+        # Add properties from the columns values
         feature['properties'] = item_dict
         feature['id'] = item_dict.pop(self.id_field)
 
@@ -568,11 +607,18 @@ class PostgreSQLProvider(BaseProvider):
 
         return property_filters
 
-    def _get_spatial_filter(self, bbox, bbox_crs, geom_wkt, geom_crs):
+    def _get_query_shape(self, bbox, bbox_crs, geom_wkt, geom_crs):
+        """
+        Builds the shape, in the SRID of the table, of the geometry or the
+        bbox of the query
+
+        :returns: the shape expression, or None when not querying spatially
+        """
 
+        # No SRID ==> No geometry ==> No spatial filtering
+        query_shape = None
         if self.srid:
             # If a geom is specified
-            query_shape = None
             if geom_wkt:
                 # If a geom_crs is specified
                 if geom_crs:
@@ -602,16 +648,17 @@ class PostgreSQLProvider(BaseProvider):
                     # Make the bbox envelope assuming the same crs as the data
                     query_shape = ST_MakeEnvelope(*bbox)
 
-            else:
-                return True  # Let everything through
+        return query_shape
 
-        else:
-            return True  # No SRID ==> No geometry ==> No spatial filtering
+    def _get_spatial_filter(self, query_shape):
+
+        if query_shape is None:
+            return True  # Let everything through
 
         geom_column = getattr(self.table_model, self.geom)
         return geom_column.ST_Intersects(query_shape)
 
-    def _select_properties_clause(self, select_properties, skip_geometry):
+    def _select_properties_columns(self, select_properties, skip_geometry):
         # List the column names that we want
         if select_properties:
             column_names = set(select_properties)
@@ -626,17 +673,16 @@ class PostgreSQLProvider(BaseProvider):
         if not skip_geometry:
             column_names.add(self.geom)
 
-        # Convert names to SQL Alchemy clause
-        selected_columns = []
-        for column_name in column_names:
-            try:
-                column = getattr(self.table_model, column_name)
-                selected_columns.append(column)
-            except AttributeError:
-                pass  # Ignore non-existent columns
-        selected_properties_clause = load_only(*selected_columns)
+        # The id is always needed for the features
+        column_names.add(self.id_field)
+
+        # Convert names to SQL Alchemy columns, in the order of the table
+        # (non-existent columns are ignored)
+        selected_columns = [getattr(self.table_model, column.name)
+                            for column in self.table_model.__table__.columns
+                            if column.name in column_names]
 
-        return selected_properties_clause
+        return selected_columns
 
     def _get_crs_transform(self, crs_transform_spec=None):
         if crs_transform_spec is not None:
@@ -647,3 +693,18 @@ class PostgreSQLProvider(BaseProvider):
         else:
             crs_transform = None
         return crs_transform
+
+
+def _is_rectangle(geom_wkt: str) -> bool:
+    """
+    Checks if the geometry wkt is an axis-aligned rectangle, in which case
+    it equals its own bounding box.
+
+    :param geom_wkt: the geometry wkt
+
+    :returns: True if the geometry is a rectangle
+    """
+
+    geom = load_wkt(geom_wkt)
+    return geom.geom_type == 'Polygon' and \
+        shapely.geometry.box(*geom.bounds).equals(geom)
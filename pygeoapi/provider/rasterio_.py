@@ -27,22 +27,37 @@
 #
 # =================================================================
 
+from contextlib import contextmanager
+import functools
 import logging
+import os
+import threading
 
+import numpy
 from pyproj import CRS, Transformer
 import rasterio
 from rasterio.io import MemoryFile
 from rasterio.warp import (reproject, calculate_default_transform)
 from rasterio.enums import Resampling
+from rasterio.errors import WindowError
+from rasterio.features import geometry_window
 import rasterio.mask
 
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
                                     ProviderQueryError)
-from pygeoapi.util import read_data
+from pygeoapi.util import read_data, load_wkt
 import shapely
 
 LOGGER = logging.getLogger(__name__)
 
+# Number of threads, and working memory (in MB), used by GDAL to reproject
+# the data
+WARP_NUM_THREADS = max(1, (os.cpu_count() or 1) - 1)
+WARP_MEM_LIMIT = 256
+
+# Tiling of the GeoTIFF outputs
+GTIFF_TILING = {'tiled': True, 'blockxsize': 256, 'blockysize': 256}
+
 
 class RasterioProvider(BaseProvider):
     """Rasterio Provider"""
@@ -58,12 +73,25 @@ class RasterioProvider(BaseProvider):
 
         try:
             self._data = rasterio.open(self.data)
+            self._datasets = []
+            self._datasets_lock = threading.Lock()
             self._coverage_properties = self._get_coverage_properties()
             self.axes = self._coverage_properties['axes']
             self.crs = self._coverage_properties['bbox_crs']
             self.num_bands = self._coverage_properties['num_bands']
             self.fields = [str(num) for num in range(1, self.num_bands+1)]
             self.native_format = provider_def['format']['name']
+
+            # The CRS in which the query shapes are reprojected
+            if self.options and 'crs' in self.options:
+                self._query_crs = CRS.from_string(self.options['crs'])
+            elif self._data.crs is not None:
+                self._query_crs = CRS.from_user_input(self._data.crs)
+            else:
+                self._query_crs = None
+            self._query_crs_epsg = self._query_crs.to_epsg() if self._query_crs else None  # noqa
+            self.warp_num_threads = provider_def.get('warp_num_threads', WARP_NUM_THREADS)  # noqa
+            self.warp_mem_limit = provider_def.get('warp_mem_limit', WARP_MEM_LIMIT)  # noqa
         except Exception as err:
             LOGGER.warning(err)
             raise ProviderConnectionError(err)
@@ -133,14 +161,18 @@ class RasterioProvider(BaseProvider):
             'field': []
         }
 
+        # Each of these reads the dataset again, read them once
+        driver = self._data.profile['driver']
+        band_units = self._data.units
+
         for i, dtype, nodataval in zip(self._data.indexes, self._data.dtypes,
                                        self._data.nodatavals):
             LOGGER.debug(f'Determing rangetype for band {i}')
+            band_tags = self._data.tags(i)
 
             name, units = None, None
-            if self._data.units[i-1] is None:
-                parameter = _get_parameter_metadata(
-                    self._data.profile['driver'], self._data.tags(i))
+            if band_units[i-1] is None:
+                parameter = _get_parameter_metadata(driver, band_tags)
                 name = parameter['description']
                 units = parameter['unit_label']
 
@@ -158,7 +190,7 @@ class RasterioProvider(BaseProvider):
                     'code': units
                 },
                 '_meta': {
-                    'tags': self._data.tags(i)
+                    'tags': band_tags
                 }
             })
 
@@ -206,16 +238,13 @@ class RasterioProvider(BaseProvider):
 
         if geom:
             # Load the wkt as a shapes (GeoJSON)
-            shapes = shapely.wkt.loads(geom)
+            shapes = load_wkt(geom)
 
-            crs_src = CRS.from_epsg(geom_crs)
-
-            if self.options and 'crs' in self.options:
-                crs_dest = CRS.from_string(self.options['crs'])
-            else:
-                crs_dest = self._data.crs
+            crs_src = _get_crs_from_epsg(geom_crs)
+            crs_dest = self._query_crs
 
-            if crs_src == crs_dest:
+            # Compare the EPSG codes first, the CRS only when they differ
+            if geom_crs == self._query_crs_epsg or crs_src == crs_dest:
                 LOGGER.debug('source geom CRS and data CRS are the same')
 
                 # Make it as GeoJSON
@@ -234,8 +263,7 @@ class RasterioProvider(BaseProvider):
 
                 # shapely>2.0
                 # Transform
-                project = Transformer.from_crs(crs_src, crs_dest, always_xy=True)  # noqa
-                shapes = shapely.ops.transform(project.transform, shapes)
+                shapes = _reproject_geometry(geom, crs_src.to_wkt(), crs_dest.to_wkt())  # noqa
 
                 # Store the bbox representation for rasterio's ouput
                 bbox = shapes.bounds
@@ -249,14 +277,11 @@ class RasterioProvider(BaseProvider):
         elif len(bbox) > 0:
             minx, miny, maxx, maxy = bbox
 
-            crs_src = CRS.from_epsg(bbox_crs)
-
-            if self.options and 'crs' in self.options:
-                crs_dest = CRS.from_string(self.options['crs'])
-            else:
-                crs_dest = self._data.crs
+            crs_src = _get_crs_from_epsg(bbox_crs)
+            crs_dest = self._query_crs
 
-            if crs_src == crs_dest:
+            # Compare the EPSG codes first, the CRS only when they differ
+            if bbox_crs == self._query_crs_epsg or crs_src == crs_dest:
                 LOGGER.debug('source bbox CRS and data CRS are the same')
                 shapes = [{
                    'type': 'Polygon',
@@ -272,9 +297,10 @@ class RasterioProvider(BaseProvider):
                 LOGGER.debug('source bbox CRS and data CRS are different')
                 LOGGER.debug('reprojecting bbox into native coordinates')
 
-                t = Transformer.from_crs(crs_src, crs_dest, always_xy=True)
-                minx2, miny2 = t.transform(minx, miny)
-                maxx2, maxy2 = t.transform(maxx, maxy)
+                # Reproject the whole bbox in one call, its edges included,
+                # so that the envelope holds all of it
+                t = _get_transformer(crs_src.to_wkt(), crs_dest.to_wkt())
+                minx2, miny2, maxx2, maxy2 = t.transform_bounds(minx, miny, maxx, maxy)  # noqa
 
                 LOGGER.debug(f'Source coordinates: {minx}, {miny}, {maxx}, {maxy}')  # noqa
                 LOGGER.debug(f'Destination: {minx2}, {miny2}, {maxx2}, {maxy2}')  # noqa
@@ -312,7 +338,7 @@ class RasterioProvider(BaseProvider):
             LOGGER.debug('Selecting bands')
             args['indexes'] = list(map(int, bands))
 
-        with rasterio.open(self.data) as _data:
+        with self._open_data() as _data:
             LOGGER.debug('Creating output coverage metadata')
             out_meta = _data.meta
 
@@ -325,13 +351,26 @@ class RasterioProvider(BaseProvider):
                 try:
                     LOGGER.debug('Clipping data spatially')
 
-                    # Query
-                    out_image, out_transform = rasterio.mask.mask(
-                        _data,
-                        filled=False,
-                        shapes=shapes,
-                        crop=True,
-                        indexes=args['indexes'])
+                    # Only the CoverageJSON output needs the mask (for its
+                    # null values), the native output is filled with nodata
+                    filled = format_ != 'json'
+
+                    # Query, a rectangle is read directly from its window
+                    rectangle = _get_rectangle_bounds(shapes)
+                    t = _data.transform
+                    north_up = t.b == t.d == 0 and t.a > 0 and t.e < 0
+                    if rectangle and north_up:
+                        out_image, out_transform = _mask_rectangle(
+                            _data, shapes, rectangle, args['indexes'],
+                            filled)
+
+                    else:
+                        out_image, out_transform = rasterio.mask.mask(
+                            _data,
+                            filled=filled,
+                            shapes=shapes,
+                            crop=True,
+                            indexes=args['indexes'])
 
                 except ValueError as err:
                     LOGGER.error(err)
@@ -348,6 +387,10 @@ class RasterioProvider(BaseProvider):
                 LOGGER.debug('Creating data in memory with band selection')
                 out_image = _data.read(indexes=args['indexes'])
 
+            # The output only holds the selected bands
+            out_meta.update({'count': out_image.shape[0],
+                             'dtype': out_image.dtype.name})
+
             if bbox:
                 out_meta['bbox'] = [bbox[0], bbox[1], bbox[2], bbox[3]]
             elif shapes:
@@ -374,22 +417,18 @@ class RasterioProvider(BaseProvider):
             # Serialize in memory to return data in native format
             LOGGER.debug('Serializing data in memory')
 
+            # GeoTIFFs are written in tiles, for faster reads of parts of
+            # them, unless the options say otherwise
+            if out_meta.get('driver') == 'GTiff':
+                for key, value in GTIFF_TILING.items():
+                    out_meta.setdefault(key, value)
+
             # If we have to reproject the image to another destination CRS
             if out_crs:
-                # Use another MemoryFile to do a reprojection
+                # Reproject the image array directly, without writing it
+                # in a first memory file
                 LOGGER.debug('Returning data in native format and reprojected')
-                with MemoryFile() as memfile:
-                    with memfile.open(**out_meta) as dest:
-                        # Write the result
-                        dest.write(out_image)
-
-                        # Create destination memory file
-                        with MemoryFile() as memfile_proj:
-                            # Reproject
-                            self.reproject_data_to_memory_file(dest, memfile_proj, out_crs, kwargs['compression'])  # noqa
-
-                            # Return the reprojected image
-                            return memfile_proj.read()
+                return self.reproject_data_to_memory_file(out_image, out_meta, out_crs, kwargs['compression'])  # noqa
 
             else:
                 # Use a single memory file and return as is
@@ -399,11 +438,43 @@ class RasterioProvider(BaseProvider):
                         dest.write(out_image)
                     return memfile.read()
 
-    def reproject_data_to_memory_file(self, dataset_src, memoryfile_dest: MemoryFile, out_crs: int, compression: str):  # noqa
+    @contextmanager
+    def _open_data(self):
+        """
+        Lends an open dataset of the data, to use in a `with` block. The
+        datasets are kept open for the next queries, and as a dataset can't
+        be read by two threads at once, each concurrent query gets its own.
+        :returns: rasterio DatasetReader object
+        """
+
+        with self._datasets_lock:
+            dataset = self._datasets.pop() if self._datasets else None
+        if dataset is None:
+            dataset = rasterio.open(self.data)
+
+        try:
+            yield dataset
+
+        finally:
+            with self._datasets_lock:
+                self._datasets.append(dataset)
+
+    def reproject_data_to_memory_file(self, data, meta: dict, out_crs: int, compression: str):  # noqa
+        """
+        Reprojects the data to another CRS and serializes it in memory
+        :param data: the data array (bands, rows, columns), possibly masked
+        :param meta: the metadata of the data (crs, transform, nodata, ...)
+        :param out_crs: the EPSG code of the CRS to reproject to
+        :param compression: the compression of the output, if any
+        :returns: the reprojected data in native format
+        """
+
         # Create the CRS
-        crs = CRS.from_epsg(out_crs)
-        transform, width, height = calculate_default_transform(dataset_src.crs, crs, dataset_src.width, dataset_src.height, *dataset_src.bounds)  # noqa
-        out_meta = dataset_src.meta.copy()
+        crs = _get_crs_from_epsg(out_crs)
+        count, height, width = data.shape
+        bounds = rasterio.transform.array_bounds(height, width, meta['transform'])  # noqa
+        transform, width, height = calculate_default_transform(meta['crs'], crs, width, height, *bounds)  # noqa
+        out_meta = meta.copy()
 
         update_params = {
             'crs': crs,
@@ -414,16 +485,30 @@ class RasterioProvider(BaseProvider):
             update_params['compress'] = compression
         out_meta.update(update_params)
 
-        with memoryfile_dest.open(**out_meta) as dest_proj:
-            for i in range(1, dataset_src.count + 1):
-                reproject(
-                    source=rasterio.band(dataset_src, i),
-                    destination=rasterio.band(dest_proj, i),
-                    src_transform=dataset_src.transform,
-                    src_crs=dataset_src.crs,
-                    dst_transform=transform,
-                    dst_crs=crs,
-                    resampling=Resampling.nearest)
+        # The masked values are filled as they would be when written
+        nodata = meta.get('nodata')
+        if isinstance(data, numpy.ma.MaskedArray):
+            data = data.filled(nodata if nodata is not None else data.fill_value)  # noqa
+
+        # Reproject all the bands at once, on multiple threads
+        data_proj = numpy.empty((count, height, width), dtype=data.dtype)
+        reproject(
+            source=data,
+            destination=data_proj,
+            src_transform=meta['transform'],
+            src_crs=meta['crs'],
+            src_nodata=nodata,
+            dst_transform=transform,
+            dst_crs=crs,
+            dst_nodata=nodata,
+            resampling=Resampling.nearest,
+            num_threads=self.warp_num_threads,
+            warp_mem_limit=self.warp_mem_limit)
+
+        with MemoryFile() as memfile:
+            with memfile.open(**out_meta) as dest:
+                dest.write(data_proj)
+            return memfile.read()
 
     def gen_covjson(self, metadata, data):
         """
@@ -491,6 +576,10 @@ class RasterioProvider(BaseProvider):
 
             cj['parameters'][pm['id']] = parameter
 
+        # The values are listed once for all the parameters, from a view of
+        # the data rather than a flattened copy
+        values = data.ravel().tolist()
+
         try:
             for key in cj['parameters'].keys():
                 cj['ranges'][key] = {
@@ -501,7 +590,7 @@ class RasterioProvider(BaseProvider):
                     'shape': [metadata['height'], metadata['width']],
                 }
                 # TODO: deal with multi-band value output
-                cj['ranges'][key]['values'] = data.flatten().tolist()
+                cj['ranges'][key]['values'] = values
         except IndexError as err:
             LOGGER.warning(err)
             raise ProviderQueryError('Invalid query parameter')
@@ -575,3 +664,117 @@ def _get_parameter_metadata(driver, band):
         parameter['observed_property_name'] = band['GRIB_COMMENT']
 
     return parameter
+
+
+def _get_rectangle_bounds(shapes):
+    """
+    Helper function to get the bounds of shapes made of a single axis-aligned
+    rectangle
+    :param shapes: list of GeoJSON-like geometries
+    :returns: tuple of (minx, miny, maxx, maxy), or None when the shapes
+              aren't a rectangle
+    """
+
+    if len(shapes) != 1 or shapes[0]['type'] != 'Polygon':
+        return None
+
+    rings = shapes[0]['coordinates']
+    if len(rings) != 1 or len(rings[0]) != 5:
+        return None
+
+    # Each side is either vertical or horizontal
+    ring = rings[0]
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        if x1 != x2 and y1 != y2:
+            return None
+
+    xs = [x for x, y in ring]
+    ys = [y for x, y in ring]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _mask_rectangle(dataset, shapes, bounds, indexes, filled):
+    """
+    Helper function doing what rasterio.mask.mask (crop=True) does for an
+    axis-aligned rectangle, with slices instead of rasterizing
+    the shape. The pixels whose center is in the rectangle are kept, on the
+    same rules and pixel coordinates as GDAL's rasterizer.
+    :param dataset: rasterio DatasetReader object, north-up (no rotation,
+                    columns going east and rows going south)
+    :param shapes: list of the rectangle as GeoJSON-like geometry
+    :param bounds: tuple of the rectangle (minx, miny, maxx, maxy)
+    :param indexes: list of bands to read (all when None)
+    :param filled: whether to fill the masked pixels with nodata (or 0),
+                   rather than returning a masked array
+    :returns: tuple of array and its affine transform
+    """
+
+    try:
+        window = geometry_window(dataset, shapes)
+    except WindowError:
+        raise ValueError('Input shapes do not overlap raster.')
+
+    transform = dataset.window_transform(window)
+    out_image = dataset.read(window=window, masked=True, indexes=indexes)
+
+    # The rectangle in pixel coordinates, computed as GDAL inverts the
+    # geotransform
+    minx, miny, maxx, maxy = bounds
+    left = -transform.c / transform.a + minx * (1.0 / transform.a)
+    right = -transform.c / transform.a + maxx * (1.0 / transform.a)
+    top = -transform.f / transform.e + maxy * (1.0 / transform.e)
+    bottom = -transform.f / transform.e + miny * (1.0 / transform.e)
+
+    cols = numpy.arange(out_image.shape[-1]) + 0.5
+    rows = numpy.arange(out_image.shape[-2]) + 0.5
+    inside = (((rows >= top) & (rows <= bottom))[:, None] &
+              ((cols > left) & (cols <= right))[None, :])
+    out_image.mask = out_image.mask | ~inside
+
+    if filled:
+        nodata = dataset.nodata if dataset.nodata is not None else 0
+        out_image = out_image.filled(nodata)
+
+    return out_image, transform
+
+
+@functools.lru_cache(maxsize=32)
+def _get_crs_from_epsg(epsg: int):
+    """
+    Helper function to get a CRS from its EPSG code, looked up once per code
+    :param epsg: int of EPSG code
+    :returns: pyproj.CRS
+    """
+
+    return CRS.from_epsg(epsg)
+
+
+@functools.lru_cache(maxsize=128)
+def _reproject_geometry(geom_wkt: str, crs_src_wkt: str, crs_dest_wkt: str):
+    """
+    Helper function to reproject a geometry. The same extraction geometry is
+    sent to every collection, so the reprojected geometries are cached
+    (shapely geometries are immutable and can safely be shared).
+    :param geom_wkt: the geometry wkt
+    :param crs_src_wkt: source CRS as WKT
+    :param crs_dest_wkt: destination CRS as WKT
+    :returns: the reprojected shapely geometry
+    """
+
+    project = _get_transformer(crs_src_wkt, crs_dest_wkt)
+    return shapely.ops.transform(project.transform, load_wkt(geom_wkt))
+
+
+@functools.lru_cache(maxsize=32)
+def _get_transformer(crs_src_wkt: str, crs_dest_wkt: str):
+    """
+    Helper function to get the (always_xy) transformer between two CRS.
+    Building one is costly, so they are kept for the next queries
+    (transformers are thread-safe).
+    :param crs_src_wkt: source CRS as WKT
+    :param crs_dest_wkt: destination CRS as WKT
+    :returns: pyproj.Transformer
+    """
+
+    return Transformer.from_crs(CRS.from_wkt(crs_src_wkt),
+                                CRS.from_wkt(crs_dest_wkt), always_xy=True)
@@ -29,7 +29,9 @@
 
 """Generic util functions used in the code"""
 
+import atexit
 import base64
+from contextlib import contextmanager
 from filelock import FileLock
 import json
 import logging
@@ -37,7 +39,7 @@ import mimetypes
 import os
 import re
 import functools
-from functools import partial
+import threading
 from dataclasses import dataclass
 from datetime import date, datetime, time
 from decimal import Decimal
@@ -49,7 +51,9 @@ from urllib.parse import urlparse
 from urllib.request import urlopen
 
 import dateutil.parser
+import numpy
 import shapely
+import shapely.wkt
 from shapely import ops
 from shapely.geometry import (
     box,
@@ -125,6 +129,19 @@ class CrsTransformSpec:
 mimetypes.add_type('text/plain', '.yaml')
 mimetypes.add_type('text/plain', '.yml')
 
+# PostgreSQL connection pools, by connection parameters (see pg_pooled_conn)
+_PG_POOLS = {}
+_PG_POOLS_LOCK = threading.Lock()
+PG_POOL_MAX_CONN = 16
+# libpq TCP keepalives of the pooled connections, so that the connections
+# dropped while idle in the pool (by a firewall or a failover) are detected
+PG_KEEPALIVES = {
+    'keepalives': 1,
+    'keepalives_idle': 60,
+    'keepalives_interval': 10,
+    'keepalives_count': 5
+}
+
 
 def dategetter(date_property: str, collection: dict) -> str:
     """
@@ -721,12 +738,28 @@ def get_crs_from_uri(uri: str) -> pyproj.CRS:
         return crs
 
 
+@functools.lru_cache(maxsize=128)
+def load_wkt(geom_wkt: str):
+    """
+    Loads a geometry from its wkt. The same extraction geometry is sent to
+    every collection, so the parsed geometries are cached (shapely
+    geometries are immutable and can safely be shared).
+
+    :param geom_wkt: the geometry wkt
+
+    :returns: the shapely geometry
+    """
+
+    return shapely.wkt.loads(geom_wkt)
+
+
+@functools.lru_cache(maxsize=128)
 def get_area_from_wkt_in_km2(geom_wkt: str, geom_crs: int):
     # Load the geom from wkt using shapely
-    shapely_geom = shapely.wkt.loads(geom_wkt)
+    shapely_geom = load_wkt(geom_wkt)
 
     # Project it to 3978 for meters
-    project = pyproj.Transformer.from_crs('EPSG:' + str(geom_crs), 'EPSG:3978')
+    project = _get_transformer_to_3978(str(geom_crs))
     shapely_geom = ops.transform(project.transform, shapely_geom)
 
     # If the shape is invalid
@@ -738,6 +771,17 @@ def get_area_from_wkt_in_km2(geom_wkt: str, geom_crs: int):
     return shapely_geom.area / 1000000
 
 
+@functools.lru_cache(maxsize=32)
+def _get_transformer_to_3978(geom_crs: str):
+    """
+    Returns the transformer from the given crs to EPSG:3978. Building one
+    looks up the crs database, so they are kept for the next extractions
+    (transformers are thread-safe).
+    """
+
+    return pyproj.Transformer.from_crs('EPSG:' + geom_crs, 'EPSG:3978')
+
+
 def get_transform_from_crs(
     crs_in: pyproj.CRS, crs_out: pyproj.CRS, always_xy: bool = False
 ) -> Callable[[GeomObject], GeomObject]:
@@ -758,10 +802,24 @@ def get_transform_from_crs(
     :returns: Function to transform the coordinates of a `GeomObject`.
     :rtype: `callable`
     """
-    crs_transform = pyproj.Transformer.from_crs(
+    transformer = pyproj.Transformer.from_crs(
         crs_in, crs_out, always_xy=always_xy,
-    ).transform
-    return partial(ops.transform, crs_transform)
+    )
+
+    def crs_transform(coords):
+        # pyproj reads size-1 arrays as scalars, a single coordinate (e.g.
+        # of a Point) is given as such
+        if len(coords) == 1:
+            return numpy.array([transformer.transform(*coords[0].tolist())])
+        return numpy.column_stack(transformer.transform(*coords.T))
+
+    # Transform all the coordinates of a geometry at once, rather than part
+    # by part as shapely.ops.transform does
+    def transform_geom(geom: GeomObject) -> GeomObject:
+        return shapely.transform(geom, crs_transform,
+                                 include_z=shapely.has_z(geom))
+
+    return transform_geom
 
 
 def crs_transform(func):
@@ -894,6 +952,100 @@ class UrlPrefetcher:
         return response.headers
 
 
+def _get_pg_pool(**conn_params):
+    """
+    Gets, creating it on first use, the psycopg2 connection pool for the
+    given connection parameters.
+
+    :param conn_params: `psycopg2.connect` keyword arguments
+
+    :returns: `psycopg2.pool.ThreadedConnectionPool`
+    """
+
+    from psycopg2.pool import ThreadedConnectionPool
+
+    key = tuple(sorted((k, str(v)) for k, v in conn_params.items()))
+    with _PG_POOLS_LOCK:
+        if key not in _PG_POOLS:
+            _PG_POOLS[key] = ThreadedConnectionPool(
+                1, PG_POOL_MAX_CONN, **{**PG_KEEPALIVES, **conn_params})
+        return _PG_POOLS[key]
+
+
+def _get_pg_live_conn(pool):
+    """
+    Gets a connection from the pool, checking that it still works. A broken
+    connection is discarded from the pool.
+
+    :param pool: `psycopg2.pool.ThreadedConnectionPool`
+
+    :returns: a `psycopg2` connection
+    """
+
+    from psycopg2 import InterfaceError, OperationalError
+
+    conn = pool.getconn()
+    try:
+        if conn.closed:
+            raise InterfaceError('connection already closed')
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    except (InterfaceError, OperationalError):
+        pool.putconn(conn, close=True)
+        raise
+
+    return conn
+
+
+@contextmanager
+def pg_pooled_conn(**conn_params):
+    """
+    Lends a psycopg2 connection from a process wide pool. Like using a
+    psycopg2 connection in a `with` block, the transaction is committed on
+    success and rolled back on error. When the pool is exhausted, a one-off
+    connection is opened (and closed) instead of failing. A pooled connection
+    found broken (e.g. after a database restart) is replaced, once.
+
+    :param conn_params: `psycopg2.connect` keyword arguments
+
+    :returns: a `psycopg2` connection
+    """
+
+    from psycopg2 import connect, InterfaceError, OperationalError
+    from psycopg2.pool import PoolError
+
+    pool = _get_pg_pool(**conn_params)
+    try:
+        try:
+            conn = _get_pg_live_conn(pool)
+        except (InterfaceError, OperationalError):
+            LOGGER.debug('Broken pooled connection discarded, retrying')
+            conn = _get_pg_live_conn(pool)
+    except PoolError:
+        LOGGER.debug('Connection pool exhausted, opening a new connection')
+        pool, conn = None, connect(**conn_params)
+
+    try:
+        with conn:
+            yield conn
+
+    finally:
+        if pool is None:
+            conn.close()
+        else:
+            # Don't give broken connections back to the pool
+            pool.putconn(conn, close=bool(conn.closed))
+
+
+@atexit.register
+def _close_pg_pools():
+    with _PG_POOLS_LOCK:
+        for pool in _PG_POOLS.values():
+            pool.closeall()
+        _PG_POOLS.clear()
+
+
 def bbox2geojsongeometry(bbox: list) -> dict:
     """
     Converts bbox values into GeoJSON geometry
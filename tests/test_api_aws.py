@@ -0,0 +1,109 @@
+"""
+Tests of the multipart uploads to S3, with a stubbed S3 client
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from pygeoapi import api_aws
+from pygeoapi.api_aws import S3MultipartWriter
+
+
+class StubS3Client:
+    """
+    Records the multipart upload calls, instead of sending them to S3
+    """
+
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.parts = {}
+        self.completed = None
+        self.aborted = False
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, Bucket, Key):
+        return {'UploadId': 'upload-1'}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_part:
+            raise RuntimeError('part failed')
+        with self._lock:
+            self.parts[PartNumber] = Body
+        return {'ETag': f'etag-{PartNumber}'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId,
+                                  MultipartUpload):
+        self.completed = MultipartUpload['Parts']
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+@pytest.fixture()
+def stub_client(monkeypatch):
+    client = StubS3Client()
+    resource = SimpleNamespace(meta=SimpleNamespace(client=client))
+    monkeypatch.setattr(api_aws, '_get_s3_resource', lambda role: resource)
+    return client
+
+
+def test_multipart_writer_parts(stub_client):
+    with S3MultipartWriter('role', 'bucket', 'prefix', 'file.zip',
+                           part_size=4, max_workers=2) as writer:
+        writer.write(b'abc')
+        writer.write(b'defghij')
+        writer.write(b'kl')
+        assert writer.tell() == 12
+
+    # The full parts, in order, and the last smaller one
+    assert stub_client.parts == {1: b'abcd', 2: b'efgh', 3: b'ijkl'}
+    assert stub_client.completed == [
+        {'PartNumber': 1, 'ETag': 'etag-1'},
+        {'PartNumber': 2, 'ETag': 'etag-2'},
+        {'PartNumber': 3, 'ETag': 'etag-3'}
+    ]
+    assert not stub_client.aborted
+
+
+def test_multipart_writer_last_part(stub_client):
+    with S3MultipartWriter('role', 'bucket', 'prefix', 'file.zip',
+                           part_size=4) as writer:
+        writer.write(b'abcdef')
+
+    assert stub_client.parts == {1: b'abcd', 2: b'ef'}
+    assert [p['PartNumber'] for p in stub_client.completed] == [1, 2]
+
+
+def test_multipart_writer_empty(stub_client):
+    with S3MultipartWriter('role', 'bucket', 'prefix', 'file.zip'):
+        pass
+
+    # S3 needs at least one part to complete the upload
+    assert stub_client.parts == {1: b''}
+    assert len(stub_client.completed) == 1
+
+
+def test_multipart_writer_abort_on_error(stub_client):
+    with pytest.raises(ValueError):
+        with S3MultipartWriter('role', 'bucket', 'prefix', 'file.zip',
+                               part_size=4) as writer:
+            writer.write(b'abcdef')
+            raise ValueError('writing failed')
+
+    assert stub_client.aborted
+    assert stub_client.completed is None
+    assert writer.closed
+
+
+def test_multipart_writer_abort_on_part_error(stub_client):
+    stub_client.fail_part = 2
+
+    with pytest.raises(RuntimeError):
+        with S3MultipartWriter('role', 'bucket', 'prefix', 'file.zip',
+                               part_size=4) as writer:
+            writer.write(b'abcdefghij')
+
+    assert stub_client.aborted
+    assert stub_client.completed is None
@@ -27,7 +27,13 @@
 #
 # =================================================================
 
+import numpy
 import pytest
+import rasterio
+import rasterio.mask
+import shapely.geometry
+from affine import Affine
+from rasterio.io import MemoryFile
 
 from pygeoapi.provider.rasterio_ import RasterioProvider
 
@@ -105,3 +111,62 @@ def test_query_bbox_reprojection(config):
     assert data['domain']['axes']['x']['stop'] == -75.0
     assert data['domain']['axes']['y']['start'] == 49.0
     assert data['domain']['axes']['y']['stop'] == 45.0
+
+
+def _write_geotiff(path, transform, count=1, dtype='uint8'):
+    """
+    Writes a small GeoTIFF, each pixel holding its own index
+    """
+
+    data = numpy.arange(count * 20 * 20).reshape(count, 20, 20)
+    with rasterio.open(path, 'w', driver='GTiff', width=20, height=20,
+                       count=count, dtype=dtype, crs='EPSG:4326',
+                       transform=transform, nodata=0) as dataset:
+        dataset.write(data.astype(dtype))
+    return str(path)
+
+
+@pytest.mark.parametrize('transform', [
+    Affine(1, 0, 0, 0, -1, 20),  # north-up
+    Affine(1, 0, 0, 0, 1, 1),  # south-up
+    Affine(-1, 0, 20, 0, -1, 20)  # east-left
+])
+def test_query_bbox_rectangle(config, tmp_path, transform):
+    config['data'] = _write_geotiff(tmp_path / 'data.tif', transform)
+    config['format'] = {'name': 'GTiff', 'mimetype': 'image/tiff'}
+    config['options'] = None
+    p = RasterioProvider(config)
+
+    bbox = [2.5, 3.2, 8.7, 9.5]
+    data = p.query(bbox=bbox, format_='GTiff')
+
+    # The same pixels as when rasterizing the rectangle
+    shape = shapely.geometry.mapping(shapely.geometry.box(*bbox))
+    with rasterio.open(config['data']) as dataset:
+        expected, expected_transform = rasterio.mask.mask(
+            dataset, [shape], crop=True)
+
+    with MemoryFile(data) as memfile:
+        with memfile.open() as dataset:
+            assert dataset.transform == expected_transform
+            assert (dataset.read() == expected).all()
+            assert (expected != 0).sum() > 0
+
+
+def test_query_bands_native(config, tmp_path):
+    config['data'] = _write_geotiff(tmp_path / 'data.tif',
+                                    Affine(1, 0, 0, 0, -1, 20),
+                                    count=3, dtype='uint16')
+    config['format'] = {'name': 'GTiff', 'mimetype': 'image/tiff'}
+    config['options'] = None
+    p = RasterioProvider(config)
+
+    # Only the selected bands are written, in the type of the data
+    for bbox in [None, [2.5, 3.2, 8.7, 9.5]]:
+        data = p.query(properties=['1', '3'], bbox=bbox, format_='GTiff')
+
+        with MemoryFile(data) as memfile:
+            with memfile.open() as dataset:
+                assert dataset.count == 2
+                assert dataset.dtypes == ('uint16', 'uint16')
+                assert dataset.read(2).max() >= 800
@@ -30,10 +30,12 @@
 from datetime import datetime, date, time
 from decimal import Decimal
 from copy import deepcopy
+import warnings
 
+import pyproj
 import pytest
 from pyproj.exceptions import CRSError
-from shapely.geometry import Point
+from shapely.geometry import LineString, Point
 
 from pygeoapi import util
 from pygeoapi.api import __version__
@@ -233,6 +235,24 @@ def test_get_transform_from_crs():
     assert p_out.equals_exact(transform_func(p_in), 1e-3)
 
 
+def test_get_transform_from_crs_point():
+    transform_func = util.get_transform_from_crs(
+        pyproj.CRS.from_epsg(4326), pyproj.CRS.from_epsg(3857),
+        always_xy=True)
+
+    # A single coordinate, with and without z, and a few at once
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        p_out = transform_func(Point(1, 2))
+        p_out_z = transform_func(Point(1, 2, 3))
+        line_out = transform_func(LineString([(1, 2), (3, 4)]))
+
+    assert p_out.equals_exact(Point(111319.4908, 222684.2085), 1e-3)
+    assert p_out_z.has_z and p_out_z.z == 3
+    assert p_out_z.equals_exact(p_out, 1e-3)
+    assert line_out.coords[0] == p_out.coords[0]
+
+
 def test_get_supported_crs_list():
     DEFAULT_CRS_LIST = [
         'http://www.opengis.net/def/crs/OGC/1.3/CRS84',